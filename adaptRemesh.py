@@ -0,0 +1,226 @@
+import shlex
+import subprocess
+
+import gmsh
+import numpy as np
+
+from analyzer import load_vtu_mesh
+from gmshGenerator import add_physical_groups, add_rectangle, set_periodic
+from meshConnectivity import build_edges, cell_geometry, edge_geometry, periodic_edge_pairs, write_fvm_sidecar
+from meshIO import get_gmsh_boundary_edges, get_gmsh_mesh, write_mesh_bin, write_mesh_txt
+
+# Elements per unit area for a cell size h: equilateral triangle area is sqrt(3)/4 h^2
+TRIANGLE_AREA_FACTOR = np.sqrt(3) / 4
+
+
+def error_indicator(points, cells, values, components=(0,), method="jump"):
+    """
+    Per-cell error indicator of a cell-centred solution.
+
+    Each component is normalized by its range so that density, velocity and field
+    jumps are comparable.
+
+    Parameters:
+        points (np.ndarray): Mesh nodes.
+        cells (np.ndarray): Connectivity with 0-based node indices.
+        values (np.ndarray): Cell data of shape (n_cells, n_vars).
+        components (tuple): Columns of values to use (e.g. 0 for density).
+        method (str): "jump": largest |u_L - u_R| over the cell's edges;
+                      "gradient": Green-Gauss gradient magnitude times the cell size.
+
+    Returns:
+        eta (np.ndarray): Indicator of shape (n_cells,), the max over the components.
+        h (np.ndarray): Current cell size sqrt(area / TRIANGLE_AREA_FACTOR).
+    """
+    n_cells = len(cells)
+    edge_nodes, edge_cells, _ = build_edges(len(points), cells)
+    area, centroid = cell_geometry(points, cells)
+    h = np.sqrt(area / TRIANGLE_AREA_FACTOR)
+
+    left = edge_cells[:, 0]
+    right = np.where(edge_cells[:, 1] >= 0, edge_cells[:, 1], left)
+    if method == "gradient":
+        length, _, normal = edge_geometry(points, edge_nodes, edge_cells, centroid)
+        flux_area = normal * length[:, None]
+
+    eta = np.zeros(n_cells)
+    for component in components:
+        u = values[:, component]
+        scale = np.ptp(u)
+        if scale == 0:
+            continue
+        u = u / scale
+        if method == "jump":
+            jump = np.abs(u[left] - u[right])
+            cell_eta = np.zeros(n_cells)
+            np.maximum.at(cell_eta, left, jump)
+            np.maximum.at(cell_eta, right, jump)
+        elif method == "gradient":
+            flux = 0.5 * (u[left] + u[right])[:, None] * flux_area
+            grad = np.zeros((n_cells, 2))
+            for d in range(2):
+                grad[:, d] = (np.bincount(left, flux[:, d], minlength=n_cells)
+                              - np.bincount(right, flux[:, d] * (right != left), minlength=n_cells))
+            cell_eta = np.hypot(grad[:, 0], grad[:, 1]) / area * h
+        else:
+            raise ValueError(f"Unknown indicator method '{method}', expected 'jump' or 'gradient'.")
+        eta = np.maximum(eta, cell_eta)
+    return eta, h
+
+
+def target_sizes(area, h, eta, budget, order=1, max_refine=8.0, max_coarsen=4.0, h_min=None, h_max=None):
+    """
+    Cell sizes equidistributing the indicator, scaled to an element budget.
+
+    With an indicator that scales like h^order, h_new = h * (eta_ref / eta)^(1/order)
+    equalizes it; the sizes are then scaled globally so that the estimated element
+    count sum(area / (TRIANGLE_AREA_FACTOR * h_new^2)) equals the budget.
+
+    Returns:
+        h_new (np.ndarray): Target size per cell.
+    """
+    eta = np.maximum(eta, 1e-12 * max(eta.max(), 1e-300))
+    eta_ref = np.average(eta, weights=area)
+    ratio = np.clip((eta_ref / eta) ** (1.0 / order), 1.0 / max_refine, max_coarsen)
+    h_new = h * ratio
+
+    h_min = h_min if h_min is not None else 0.0
+    h_max = h_max if h_max is not None else np.inf
+    # Clipping to [h_min, h_max] breaks the exact scaling; a few rounds converge
+    for _ in range(10):
+        n_estimate = np.sum(area / (TRIANGLE_AREA_FACTOR * h_new ** 2))
+        h_new = np.clip(h_new * np.sqrt(n_estimate / budget), h_min, h_max)
+    return h_new
+
+
+def node_sizes(n_nodes, cells, h_cell):
+    """Smallest target size of the cells around every node."""
+    h_node = np.full(n_nodes, np.inf)
+    np.minimum.at(h_node, cells.ravel(), np.repeat(h_cell, cells.shape[1]))
+    return h_node
+
+
+def remesh(points, cells, h_node, output, algorithm=6, sidecar=True, periodic=False):
+    """
+    Meshes the bounding rectangle of the old mesh with gmsh, using the old mesh and
+    h_node as the background size field, and exports <output>.txt/.mshb(/.fvm) with
+    the $BoundaryEdges (and, if periodic, $PeriodicEdges) sections of gmshGenerator.
+
+    Returns:
+        coords (np.ndarray), elements (np.ndarray): The new mesh.
+    """
+    x_min, y_min = points[:, :2].min(axis=0)
+    x_max, y_max = points[:, :2].max(axis=0)
+
+    gmsh.initialize()
+    try:
+        lines, surface = add_rectangle(x_min, x_max, y_min, y_max, h_node.max())
+        gmsh.model.geo.synchronize()
+        add_physical_groups(lines, surface)
+        if periodic:
+            translations = set_periodic(lines, (x_min, x_max, y_min, y_max))
+
+        # Background mesh: scalar triangles "ST" = x1 x2 x3 y1 y2 y3 z1 z2 z3 v1 v2 v3
+        xyz = np.zeros((len(cells), 3, 3))
+        xyz[:, :, :2] = points[:, :2][cells]
+        data = np.concatenate((xyz.transpose(0, 2, 1).reshape(-1, 9), h_node[cells]), axis=1)
+        view = gmsh.view.add("size")
+        gmsh.view.addListData(view, "ST", len(cells), data.ravel())
+        field = gmsh.model.mesh.field.add("PostView")
+        gmsh.model.mesh.field.setNumber(field, "ViewTag", view)
+        gmsh.model.mesh.field.setAsBackgroundMesh(field)
+
+        gmsh.option.setNumber("Mesh.MeshSizeExtendFromBoundary", 0)
+        gmsh.option.setNumber("Mesh.MeshSizeFromPoints", 0)
+        gmsh.option.setNumber("Mesh.MeshSizeFromCurvature", 0)
+        gmsh.option.setNumber("Mesh.Algorithm", algorithm)
+
+        gmsh.model.mesh.generate(2)
+        coords, elements = get_gmsh_mesh(2)
+        sections = {"BoundaryEdges": get_gmsh_boundary_edges()}
+    finally:
+        gmsh.finalize()
+    if periodic:
+        sections["PeriodicEdges"] = periodic_edge_pairs(coords, elements, translations)
+
+    write_mesh_txt(f"{output}.txt", coords, elements, sections=sections)
+    write_mesh_bin(f"{output}.mshb", coords, elements, sections)
+    if sidecar:
+        write_fvm_sidecar(f"{output}.fvm", coords, elements)
+    return coords, elements
+
+
+def adapt(vtu, output, budget, components=(0,), method="jump", data_field="elemUs", periodic=False,
+          **size_options):
+    """
+    One adaptation step: solver VTU -> indicator -> size field -> new mesh.
+
+    Parameters:
+        vtu (str): Solver output with cell data data_field.
+        output (str): Output path of the new mesh without extension.
+        budget (int): Target number of elements.
+        components, method: See error_indicator.
+        periodic (bool): Periodic new mesh (see remesh).
+        size_options: h_min, h_max, max_refine, max_coarsen, order of target_sizes.
+
+    Returns:
+        summary (dict): Old and new element counts and indicator statistics.
+    """
+    points, cells, values = load_vtu_mesh(vtu, data_field)
+    eta, h = error_indicator(points, cells, values, components, method)
+    area, _ = cell_geometry(points, cells)
+    h_cell = target_sizes(area, h, eta, budget, **size_options)
+    coords, elements = remesh(points, cells, node_sizes(len(points), cells, h_cell), output,
+                              periodic=periodic)
+    return {
+        "vtu": vtu,
+        "output": output,
+        "old_elements": len(cells),
+        "new_elements": len(elements),
+        "eta_max": float(eta.max()),
+        "h_min": float(h_cell.min()),
+        "h_max": float(h_cell.max()),
+    }
+
+
+def adaptation_loop(vtu, output, budget, iterations=1, solver=None, **adapt_options):
+    """
+    Repeats adapt -> solve. The solver command is a template with {mesh} (mesh path
+    without extension), {vtu} (solution path to write) and {iteration} placeholders;
+    without a solver only one adaptation step is made.
+
+    Returns:
+        summaries (list): One adapt summary per iteration.
+    """
+    summaries = []
+    for iteration in range(iterations):
+        mesh = output.format(iteration=iteration)
+        summaries.append(adapt(vtu, mesh, budget, **adapt_options))
+        if solver is None:
+            break
+        vtu = f"{mesh}.vtu"
+        subprocess.run(shlex.split(solver.format(mesh=mesh, vtu=vtu, iteration=iteration)), check=True)
+    return summaries
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Remesh from a solver VTU with an error-driven size field.")
+    parser.add_argument("vtu", help="solver output with cell data (elemUs)")
+    parser.add_argument("--budget", type=int, required=True, help="target number of elements")
+    parser.add_argument("--components", type=int, nargs="+", default=[0], help="elemUs columns to use")
+    parser.add_argument("--method", default="jump", choices=("jump", "gradient"))
+    parser.add_argument("--h-min", type=float)
+    parser.add_argument("--h-max", type=float)
+    parser.add_argument("--periodic", action="store_true", help="periodic boundaries in x and y")
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--solver", help="solver command template, e.g. 'solver {mesh}.txt {vtu}'")
+    parser.add_argument("--output", default="mesh_adapt{iteration}", help="output path; {iteration} is replaced")
+    args = parser.parse_args()
+
+    for summary in adaptation_loop(args.vtu, args.output, args.budget, args.iterations, args.solver,
+                                   components=tuple(args.components), method=args.method,
+                                   periodic=args.periodic, h_min=args.h_min, h_max=args.h_max):
+        print(f"Info    : {summary['vtu']} ({summary['old_elements']} cells) -> {summary['output']} "
+              f"({summary['new_elements']} cells), h in [{summary['h_min']:.3e}, {summary['h_max']:.3e}]")
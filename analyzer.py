@@ -1,13 +1,33 @@
-import numpy as np
-import pyvista as pv
-from scipy.interpolate import griddata
+import csv
+import glob
 import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags
+from scipy.spatial import Delaunay, cKDTree
+
+from meshConnectivity import build_edges, cell_geometry
+from vtuIO import cell_centers, read_vtu, uniform_cells
+
+# Components averaged by analyze_errors: v, w and B_y
+ERROR_COMPONENTS = (2, 3, 6)
+# "delaunay": linear interpolation between fine cell centres (interpolation_matrix);
+# "constant"/"reconstructed": lookup in the fine mesh's own cells (mesh_interpolation_matrix)
+INTERPOLATION_METHODS = ("delaunay", "constant", "reconstructed")
+# Query points per block of locate_cells (bounds the candidate arrays)
+LOCATE_CHUNK = 65536
 
 
 def load_vtu(filename, data_field='elemUs'):
     """
-    Loads a VTU file using PyVista and returns the cell-center coordinates
-    along with the cell data for the given field.
+    Loads a VTU file and returns the cell-center coordinates along with the cell data
+    for the given field. Only the points, the cells and data_field are decoded
+    (vtuIO.read_vtu); cell centers are the mean of the cell nodes, as in pyvista.
 
     Parameters:
         filename (str): Path to the VTU file.
@@ -17,20 +37,37 @@ def load_vtu(filename, data_field='elemUs'):
         points (np.ndarray): An array of shape (n_cells, 3) with the cell centers.
         values (np.ndarray): An array of shape (n_cells, n_vars) with the state data.
     """
-    mesh = pv.read(filename)
-    # Compute cell centers (centroids) of the elements
-    cell_centers = mesh.cell_centers()
-    points = cell_centers.points  # shape: (n_cells, 3)
+    try:
+        arrays = read_vtu(filename, cell_fields=(data_field,))
+    except KeyError:
+        raise ValueError(f"Data field '{data_field}' not found in {filename}.") from None
+    points = cell_centers(arrays["points"], arrays["connectivity"], arrays["offsets"])
+    return points, arrays[data_field]
 
-    # Try to get the cell data from the cell centers; if not available, try the mesh
-    if data_field in cell_centers.cell_data:
-        values = cell_centers.cell_data[data_field]
-    elif data_field in mesh.cell_data:
-        values = mesh.cell_data[data_field]
-    else:
-        raise ValueError(f"Data field '{data_field}' not found in {filename}.")
 
-    return points, values
+def load_vtu_mesh(filename, data_field='elemUs'):
+    """
+    Loads a VTU file and returns the mesh topology together with the cell data for
+    the given field (vtuIO.read_vtu, nothing else is decoded).
+
+    Parameters:
+        filename (str): Path to the VTU file.
+        data_field (str): Name of the cell data array (here, "elemUs").
+
+    Returns:
+        points (np.ndarray): An array of shape (n_points, 3) with the mesh nodes.
+        cells (np.ndarray): An array of shape (n_cells, k) with 0-based node indices.
+        values (np.ndarray): An array of shape (n_cells, n_vars) with the state data.
+    """
+    try:
+        arrays = read_vtu(filename, cell_fields=(data_field,))
+    except KeyError:
+        raise ValueError(f"Data field '{data_field}' not found in {filename}.") from None
+    try:
+        cells = uniform_cells(arrays["connectivity"], arrays["offsets"])
+    except ValueError:
+        raise ValueError(f"{filename} mixes cell types; only uniform meshes are supported.") from None
+    return arrays["points"], cells, arrays[data_field]
 
 
 def remove_constant_dims(points, tol=1e-14):
@@ -50,6 +87,236 @@ def remove_constant_dims(points, tol=1e-14):
     return points[:, keep], keep
 
 
+def build_interpolator(fine_points, tol=1e-12):
+    """
+    Triangulates the fine cell centres once, for interpolation onto any number of
+    coarse meshes (see interpolation_matrix).
+
+    Parameters:
+        fine_points (np.ndarray): Coordinates of fine mesh cell centers.
+        tol (float): Variation below which a coordinate is dropped (remove_constant_dims).
+
+    Returns:
+        interpolator (tuple): (keep, triangulation, tree): the kept coordinate indices,
+                              the Delaunay triangulation of the reduced points (None in 1D)
+                              and a cKDTree on them for the nearest-neighbour fallback.
+    """
+    fine_pts_red, keep = remove_constant_dims(fine_points, tol=tol)
+    triangulation = Delaunay(fine_pts_red) if len(keep) > 1 else None
+    return keep, triangulation, cKDTree(fine_pts_red)
+
+
+def interpolation_matrix(interpolator, coarse_points):
+    """
+    Sparse (n_coarse, n_fine) matrix of linear interpolation weights: the barycentric
+    coordinates of every coarse point in its fine simplex, which is what
+    griddata(method='linear') evaluates. Points outside the fine convex hull take
+    their nearest fine point (griddata(method='nearest')).
+
+    Parameters:
+        interpolator (tuple): Output of build_interpolator.
+        coarse_points (np.ndarray): Coordinates of the coarse mesh cell centers.
+
+    Returns:
+        matrix (scipy.sparse.csr_matrix): fine values -> values at the coarse points.
+    """
+    keep, triangulation, tree = interpolator
+    points = coarse_points[:, keep]
+    n_coarse, n_fine = len(points), tree.n
+    if triangulation is None:
+        # 1D: linear interpolation between the neighbouring fine points
+        x = tree.data[:, 0]
+        order = np.argsort(x)
+        right = np.clip(np.searchsorted(x[order], points[:, 0]), 1, n_fine - 1)
+        x0, x1 = x[order[right - 1]], x[order[right]]
+        t = (points[:, 0] - x0) / (x1 - x0)
+        simplex = np.where((t >= 0) & (t <= 1), 0, -1)
+        vertices = np.stack((order[right - 1], order[right]), axis=1)
+        weights = np.stack((1 - t, t), axis=1)
+    else:
+        simplex = triangulation.find_simplex(points)
+        transform = triangulation.transform[simplex]
+        d = points.shape[1]
+        bary = np.einsum("ijk,ik->ij", transform[:, :d], points - transform[:, d])
+        weights = np.concatenate((bary, 1 - bary.sum(axis=1, keepdims=True)), axis=1)
+        vertices = triangulation.simplices[simplex]
+
+    outside = simplex < 0
+    if np.any(outside):
+        _, nearest = tree.query(points[outside])
+        vertices[outside] = nearest[:, None]
+        weights[outside] = 0.0
+        weights[outside, 0] = 1.0
+    rows = np.repeat(np.arange(n_coarse), vertices.shape[1])
+    return csr_matrix((weights.ravel(), (rows, vertices.ravel())), shape=(n_coarse, n_fine))
+
+
+def build_locator(nodes, cells, gradients=True, tol=1e-12):
+    """
+    Prepares the fine mesh once for locating points in its cells (locate_cells) and
+    for mesh_interpolation_matrix on any number of coarse meshes.
+
+    Coordinates without variation are dropped as in build_interpolator (remove_constant_dims),
+    so meshes in any coordinate plane work; the remaining two are used.
+
+    Parameters:
+        nodes (np.ndarray): Fine mesh nodes.
+        cells (np.ndarray): (n_cells, k) fine connectivity with 0-based node indices.
+        gradients (bool): Also build the least-squares gradient operators ("reconstructed").
+        tol (float): Variation below which a coordinate is dropped.
+
+    Returns:
+        locator (dict): keep (kept coordinate indices), centroid, tree (cKDTree on the
+                        centroids), polygons, edges, orientation and tol of the
+                        point-in-polygon test, and gradients ((Gx, Gy) or None).
+    """
+    xy, keep = remove_constant_dims(np.asarray(nodes, dtype=np.float64), tol=tol)
+    if len(keep) != 2:
+        raise ValueError(f"Mesh-based interpolation needs a planar 2D mesh, got {len(keep)} varying coordinates.")
+    cells = np.asarray(cells)
+    _, centroid = cell_geometry(xy, cells)
+    polygons = xy[cells]
+    edges = np.roll(polygons, -1, axis=1) - polygons
+    return {
+        "keep": keep,
+        "centroid": centroid,
+        "tree": cKDTree(centroid),
+        "polygons": polygons,
+        "edges": edges,
+        "orientation": np.sign(np.sum(polygons[..., 0] * edges[..., 1] - polygons[..., 1] * edges[..., 0], axis=1)),
+        "tol": 1e-10 * np.einsum("...i,...i->...", edges, edges),
+        "gradients": gradient_operators(xy, cells, centroid) if gradients else None,
+    }
+
+
+def locate_cells(locator, query, candidates=8):
+    """
+    Finds the fine cell containing every query point: the KD-tree on the cell centroids
+    proposes the nearest candidates, a vectorized point-in-polygon test (convex cells)
+    picks the first that contains the point.
+
+    Parameters:
+        locator (dict): Output of build_locator.
+        query (np.ndarray): Query coordinates (reduced to the locator's kept coordinates).
+        candidates (int): Nearest cells tested per point.
+
+    Returns:
+        cell (np.ndarray): (n_query,) containing cell, or the cell with the nearest
+                           centroid for points that no candidate contains.
+        found (np.ndarray): (n_query,) True where a containing cell was found.
+    """
+    query = np.asarray(query)[:, locator["keep"]]
+    polygons, edges = locator["polygons"], locator["edges"]
+    orientation, tol = locator["orientation"], locator["tol"]
+    k = min(candidates, len(polygons))
+    _, nearest = locator["tree"].query(query, k=k)
+    nearest = nearest.reshape(len(query), k)
+
+    cell = nearest[:, 0].copy()
+    found = np.zeros(len(query), dtype=bool)
+    for start in range(0, len(query), LOCATE_CHUNK):
+        block = nearest[start:start + LOCATE_CHUNK]
+        rel = query[start:start + LOCATE_CHUNK, None, None, :] - polygons[block]
+        edge = edges[block]
+        cross = (edge[..., 0] * rel[..., 1] - edge[..., 1] * rel[..., 0]) * orientation[block][..., None]
+        inside = np.all(cross >= -tol[block], axis=2)
+        hit = inside.any(axis=1)
+        first = np.argmax(inside, axis=1)
+        cell[start:start + LOCATE_CHUNK] = np.where(hit, block[np.arange(len(block)), first], block[:, 0])
+        found[start:start + LOCATE_CHUNK] = hit
+    return cell, found
+
+
+def gradient_operators(points, cells, centroid=None):
+    """
+    Least-squares cell gradients of cell-centred data over the edge neighbours, as
+    sparse (n_cells, n_cells) matrices: grad_x = Gx @ u, grad_y = Gy @ u (in the first
+    two coordinates of points). Cells with fewer than two independent neighbour
+    directions get a zero gradient.
+    """
+    xy = np.asarray(points)[:, :2]
+    n_cells = len(cells)
+    if centroid is None:
+        _, centroid = cell_geometry(xy, cells)
+    _, edge_cells, _ = build_edges(len(xy), cells)
+    left, right = edge_cells[edge_cells[:, 1] >= 0].T
+    # Both directions of every interior edge: (cell, neighbour)
+    own = np.concatenate((left, right))
+    other = np.concatenate((right, left))
+    d = centroid[other] - centroid[own]
+
+    mxx = np.bincount(own, d[:, 0] * d[:, 0], minlength=n_cells)
+    mxy = np.bincount(own, d[:, 0] * d[:, 1], minlength=n_cells)
+    myy = np.bincount(own, d[:, 1] * d[:, 1], minlength=n_cells)
+    det = mxx * myy - mxy ** 2
+    regular = det > 1e-12 * (mxx + myy) ** 2
+    inv_det = np.where(regular, 1.0 / np.where(regular, det, 1.0), 0.0)
+    # Coefficients of (u_other - u_own) in the gradient of own: M^-1 d
+    ax = (myy[own] * d[:, 0] - mxy[own] * d[:, 1]) * inv_det[own]
+    ay = (mxx[own] * d[:, 1] - mxy[own] * d[:, 0]) * inv_det[own]
+
+    rows = np.concatenate((own, own))
+    cols = np.concatenate((other, own))
+    shape = (n_cells, n_cells)
+    gx = coo_matrix((np.concatenate((ax, -ax)), (rows, cols)), shape=shape).tocsr()
+    gy = coo_matrix((np.concatenate((ay, -ay)), (rows, cols)), shape=shape).tocsr()
+    return gx, gy
+
+
+def mesh_interpolation_matrix(locator, query, method="constant", candidates=8):
+    """
+    Sparse (n_query, n_cells) operator evaluating cell-centred fine data at the query
+    points from the fine mesh's own cells, without any triangulation of the centroids.
+
+    "constant" takes the value of the containing cell, so values are never mixed
+    across cell boundaries (shocks stay sharp). "reconstructed" adds the linear
+    least-squares reconstruction u_c + grad_c . (x - x_c) of the containing cell
+    (unlimited, so it may overshoot next to discontinuities).
+
+    Parameters:
+        locator (dict): Fine mesh prepared by build_locator (with gradients for "reconstructed").
+        query (np.ndarray): Coarse cell centers.
+        method (str): "constant" or "reconstructed".
+        candidates (int): See locate_cells.
+
+    Returns:
+        matrix (scipy.sparse.csr_matrix): fine cell values -> values at the query points.
+    """
+    if method not in ("constant", "reconstructed"):
+        raise ValueError(f"Unknown mesh interpolation method '{method}', expected 'constant' or 'reconstructed'.")
+    centroid = locator["centroid"]
+    cell, _ = locate_cells(locator, query, candidates)
+    n_query, n_cells = len(cell), len(centroid)
+    select = csr_matrix((np.ones(n_query), (np.arange(n_query), cell)), shape=(n_query, n_cells))
+    if method == "constant":
+        return select
+    if locator["gradients"] is None:
+        raise ValueError("Reconstructed interpolation needs a locator built with gradients=True.")
+    gx, gy = locator["gradients"]
+    offset = np.asarray(query)[:, locator["keep"]] - centroid[cell]
+    return (select + diags(offset[:, 0]) @ (select @ gx) + diags(offset[:, 1]) @ (select @ gy)).tocsr()
+
+
+def relative_errors(coarse_values, fine_values_interp, var_indices):
+    """
+    Relative errors of several components at once, see compute_relative_error.
+
+    Parameters:
+        coarse_values (np.ndarray): Coarse mesh state data.
+        fine_values_interp (np.ndarray): Fine state data interpolated at the coarse cell centers.
+        var_indices (tuple): Component indices.
+
+    Returns:
+        rel_errors (np.ndarray): One relative error per component (NaN where the fine sum is zero).
+    """
+    var_indices = list(var_indices)
+    psi_fine_interp = fine_values_interp[:, var_indices]
+    error_sum = np.sum(np.abs(coarse_values[:, var_indices] - psi_fine_interp), axis=0)
+    abs_sum = np.sum(np.abs(psi_fine_interp), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(abs_sum != 0, error_sum / abs_sum, np.nan)
+
+
 def compute_relative_error(coarse_points, coarse_values, fine_points, fine_values, var_index):
     """
     Computes the relative error for a single component (specified by var_index)
@@ -58,6 +325,8 @@ def compute_relative_error(coarse_points, coarse_values, fine_points, fine_value
         δ(ψ) = sum(|ψ_coarse - ψ_fine_interp|) / sum(|ψ_fine_interp|)
 
     where ψ_fine_interp is the fine solution interpolated at the coarse cell centers.
+    For several components or coarse meshes, build the interpolator and the matrix once
+    and use relative_errors, as analyze_errors does.
 
     Parameters:
         coarse_points (np.ndarray): Coordinates of coarse mesh cell centers.
@@ -69,33 +338,230 @@ def compute_relative_error(coarse_points, coarse_values, fine_points, fine_value
     Returns:
         rel_error (float): The computed relative error.
     """
-    # Combine points to find dimensions to keep based on both meshes
-    combined_points = np.vstack((coarse_points, fine_points))
-    combined_pts_red, keep_idx = remove_constant_dims(combined_points, tol=1e-12)
+    matrix = interpolation_matrix(build_interpolator(fine_points), coarse_points)
+    fine_values_interp = matrix @ fine_values[:, [var_index]]
+    return float(relative_errors(coarse_values[:, [var_index]], fine_values_interp, [0])[0])
 
-    # Reduce dimensions for both meshes using the same keep indices
-    coarse_pts_red = coarse_points[:, keep_idx]
-    fine_pts_red = fine_points[:, keep_idx]
 
-    psi_coarse = coarse_values[:, var_index]
-    psi_fine = fine_values[:, var_index]
+def load_fine(fine_file, method="delaunay", data_field='elemUs'):
+    """
+    Loads the fine solution in the form the interpolation method needs.
+
+    Returns:
+        fine (dict): "values" plus "points" (cell centers) for "delaunay", or
+                     "nodes" and "cells" for the mesh-based methods.
+    """
+    if method == "delaunay":
+        points, values = load_vtu(fine_file, data_field)
+        return {"points": points, "values": values}
+    nodes, cells, values = load_vtu_mesh(fine_file, data_field)
+    return {"nodes": nodes, "cells": cells, "values": values}
+
+
+def build_fine_operator(fine, method="delaunay"):
+    """
+    Everything about the fine mesh that the interpolation method reuses for every
+    coarse mesh: build_interpolator for "delaunay", build_locator otherwise.
+    """
+    if method == "delaunay":
+        return build_interpolator(fine["points"])
+    return build_locator(fine["nodes"], fine["cells"], gradients=method == "reconstructed")
 
-    # Interpolate the fine solution onto the coarse points.
-    psi_fine_interp = griddata(fine_pts_red, psi_fine, coarse_pts_red, method='linear')
 
-    # Fill remaining NaNs with nearest neighbor interpolation
-    nan_idx = np.isnan(psi_fine_interp)
-    if np.any(nan_idx):
-        psi_fine_interp[nan_idx] = griddata(fine_pts_red, psi_fine, coarse_pts_red[nan_idx], method='nearest')
+def interpolation_operator(fine_operator, coarse_points, method="delaunay"):
+    """Sparse fine -> coarse interpolation matrix from a build_fine_operator result."""
+    if method == "delaunay":
+        return interpolation_matrix(fine_operator, coarse_points)
+    return mesh_interpolation_matrix(fine_operator, coarse_points, method)
 
-    # Calculate sums
-    error_sum = np.sum(np.abs(psi_coarse - psi_fine_interp))
-    abs_sum = np.sum(np.abs(psi_fine_interp))
 
-    # Handle division by zero
-    return error_sum / abs_sum if abs_sum != 0 else np.nan
+def coarse_mesh_error(fine, coarse_points, coarse_values, method="delaunay", fine_operator=None):
+    """
+    Average relative error of the ERROR_COMPONENTS of one coarse solution against the
+    fine one (from load_fine; fine_operator from build_fine_operator, built here if not given).
+    """
+    if fine_operator is None:
+        fine_operator = build_fine_operator(fine, method)
+    # One interpolation matrix per coarse mesh, applied to all components at once
+    matrix = interpolation_operator(fine_operator, coarse_points, method)
+    fine_values_interp = matrix @ fine["values"]
+    return float(relative_errors(coarse_values, fine_values_interp, ERROR_COMPONENTS).mean())
+
+
+def share_arrays(arrays):
+    """
+    Copies arrays into shared memory blocks for worker processes (see attach_arrays).
 
-def analyze_errors(mesh_files, fine_file):
+    Returns:
+        blocks (list): SharedMemory handles; close() and unlink() them when done.
+        specs (dict): name -> (block name, shape, dtype), picklable.
+    """
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.copyto(np.ndarray(array.shape, array.dtype, buffer=block.buf), array)
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_arrays(specs):
+    """
+    Read-only views of arrays shared with share_arrays.
+
+    Returns:
+        blocks (list): SharedMemory handles that must outlive the arrays.
+        arrays (dict): name -> np.ndarray on the shared block.
+    """
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[name] = array
+    return blocks, arrays
+
+
+# Fine solution and its interpolator/locator in an error worker process, set up once by _init_error_worker
+_worker_fine = {}
+
+
+def _init_error_worker(specs, method):
+    blocks, fine = attach_arrays(specs)
+    _worker_fine.update(fine, blocks=blocks, method=method)
+    _worker_fine["fine_operator"] = build_fine_operator(fine, method)
+
+
+def _worker_error(coarse_points, coarse_values):
+    return coarse_mesh_error(_worker_fine, coarse_points, coarse_values, _worker_fine["method"],
+                             _worker_fine["fine_operator"])
+
+
+def coarse_errors(mesh_files, fine_file, method="delaunay", workers=1):
+    """
+    Average relative error of every coarse mesh (see analyze_errors).
+
+    With workers > 1 the VTU files are decoded concurrently in a thread pool (file I/O
+    and numpy release the GIL), and the coarse meshes are processed in a pool of
+    workers processes. The fine solution is placed in shared memory once and attached
+    by every worker, which triangulates it ("delaunay") or builds its cell locator once. Each error
+    depends only on its own coarse mesh, so the results do not depend on scheduling.
+
+    Returns:
+        errors (dict): Mesh identifier -> average relative error.
+    """
+    if method not in INTERPOLATION_METHODS:
+        raise ValueError(f"Unknown interpolation method '{method}', expected one of {INTERPOLATION_METHODS}.")
+    items = sorted(mesh_files.items())
+    if workers <= 1:
+        fine = load_fine(fine_file, method)
+        fine_operator = build_fine_operator(fine, method)
+        return {res: coarse_mesh_error(fine, *load_vtu(fname, data_field='elemUs'), method, fine_operator)
+                for res, fname in items}
+
+    with ThreadPoolExecutor(max_workers=workers) as loaders:
+        fine_future = loaders.submit(load_fine, fine_file, method)
+        coarse_futures = [loaders.submit(load_vtu, fname, 'elemUs') for _, fname in items]
+        blocks, specs = share_arrays(fine_future.result())
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                     initializer=_init_error_worker, initargs=(specs, method)) as pool:
+                futures = [pool.submit(_worker_error, *future.result()) for future in coarse_futures]
+                return {res: future.result() for (res, _), future in zip(items, futures)}
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+
+def frame_number(filename):
+    """Frame number of a snapshot file: the last integer in its name (e.g. mesh5_100_0042.vtu -> 42)."""
+    numbers = re.findall(r"\d+", os.path.basename(filename))
+    if not numbers:
+        raise ValueError(f"No frame number in {filename}.")
+    return int(numbers[-1])
+
+
+def snapshot_sequences(patterns):
+    """
+    Matches snapshot sequences by frame number.
+
+    Parameters:
+        patterns (dict): Sequence key (e.g. resolution) -> glob pattern of its VTU files.
+
+    Returns:
+        frames (list): (frame, {key: filename}) for the frames present in every sequence,
+                       in increasing frame order.
+    """
+    sequences = {key: {frame_number(f): f for f in glob.glob(pattern)} for key, pattern in patterns.items()}
+    for key, files in sequences.items():
+        if not files:
+            raise ValueError(f"No snapshots match {patterns[key]}.")
+    common = sorted(set.intersection(*(set(files) for files in sequences.values())))
+    return [(frame, {key: files[frame] for key, files in sequences.items()}) for frame in common]
+
+
+def _frame_values(filename, data_field='elemUs'):
+    """Cell data of one snapshot; points and cells are not decoded (the mesh is fixed)."""
+    return read_vtu(filename, cell_fields=(data_field,), points=False, cells=False)[data_field]
+
+
+def time_series_errors(coarse_patterns, fine_pattern, output, method="delaunay"):
+    """
+    Error-versus-time curves: analyze_errors for every frame of matched VTU snapshot
+    sequences, streamed one frame at a time.
+
+    The meshes are fixed over time, so the interpolation operators are built once from
+    the first frame; every frame then only decodes the elemUs arrays and applies the
+    operators. Only one frame per resolution is in memory at a time, and every row is
+    written as soon as it is computed.
+
+    Parameters:
+        coarse_patterns (dict): Mesh identifier (e.g. 50, 100, 200) -> glob pattern of
+                                its snapshots (e.g. "mesh5_50_*.vtu").
+        fine_pattern (str): Glob pattern of the fine solution's snapshots.
+        output (str): CSV table with one row per frame: frame, delta_<N> for every
+                      coarse mesh and rate_<N_prev>_<N> between successive ones.
+        method (str): Interpolation of the fine solution, one of INTERPOLATION_METHODS.
+
+    Returns:
+        frames (int): Number of frames written.
+    """
+    if method not in INTERPOLATION_METHODS:
+        raise ValueError(f"Unknown interpolation method '{method}', expected one of {INTERPOLATION_METHODS}.")
+    resolutions = sorted(coarse_patterns)
+    frames = snapshot_sequences(dict(coarse_patterns, fine=fine_pattern))
+    if not frames:
+        raise ValueError("The snapshot sequences have no frame in common.")
+
+    # Operators from the first frame
+    _, first = frames[0]
+    fine_operator = build_fine_operator(load_fine(first["fine"], method), method)
+    operators = {res: interpolation_operator(fine_operator, load_vtu(first[res])[0], method)
+                 for res in resolutions}
+    del fine_operator
+
+    pairs = list(zip(resolutions[:-1], resolutions[1:]))
+    columns = (["frame"] + [f"delta_{res}" for res in resolutions]
+               + [f"rate_{prev}_{curr}" for prev, curr in pairs])
+    with open(output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for frame, files in frames:
+            fine_values = _frame_values(files["fine"])
+            errors = {}
+            for res in resolutions:
+                fine_values_interp = operators[res] @ fine_values
+                errors[res] = relative_errors(_frame_values(files[res]), fine_values_interp, ERROR_COMPONENTS).mean()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rates = [np.log2(errors[prev] / errors[curr]) for prev, curr in pairs]
+            writer.writerow([frame] + [f"{errors[res]:.6e}" for res in resolutions] + [f"{rate:.4f}" for rate in rates])
+    return len(frames)
+
+
+def analyze_errors(mesh_files, fine_file, method="delaunay", workers=1):
     """
     For each coarse mesh VTU file, computes the average relative error
     for the variables v (index 2), w (index 3), and B_y (index 6) with
@@ -107,23 +573,17 @@ def analyze_errors(mesh_files, fine_file):
         mesh_files (dict): Mapping of a mesh identifier (e.g., 50, 100, 200)
                            to the filename of the coarse VTU file.
         fine_file (str): Filename of the fine solution VTU file.
-    """
-    # Load the fine (exact) solution.
-    fine_points, fine_values = load_vtu(fine_file, data_field='elemUs')
+        method (str): Interpolation of the fine solution, one of INTERPOLATION_METHODS.
+        workers (int): Threads for loading and processes for the error computation
+                       (1 = everything in this process), see coarse_errors.
 
-    errors = {}
+    Returns:
+        errors (dict): Mesh identifier -> average relative error.
+    """
+    # Errors for v (index 2), w (index 3), and B_y (index 6), averaged per coarse mesh
+    errors = coarse_errors(mesh_files, fine_file, method, workers)
     print("Relative Errors:")
-    # For each coarse mesh, compute errors for the three variables and average them.
-    for res, fname in sorted(mesh_files.items()):
-        coarse_points, coarse_values = load_vtu(fname, data_field='elemUs')
-
-        # Compute errors for v (index 2), w (index 3), and B_y (index 6)
-        err_v = compute_relative_error(coarse_points, coarse_values, fine_points, fine_values, 2)
-        err_w = compute_relative_error(coarse_points, coarse_values, fine_points, fine_values, 3)
-        err_By = compute_relative_error(coarse_points, coarse_values, fine_points, fine_values, 6)
-
-        avg_err = (err_v + err_w + err_By) / 3.0
-        errors[res] = avg_err
+    for res, avg_err in sorted(errors.items()):
         print(f"  Mesh {res:3d}: δ_{res} = {avg_err:.4e}")
 
     # Compute convergence rates R_N = log2(δ_{N_previous}/δ_N)
@@ -137,16 +597,32 @@ def analyze_errors(mesh_files, fine_file):
         else:
             rate = math.log2(errors[res_prev] / errors[res_curr])
         print(f"  From Mesh {res_prev:3d} to Mesh {res_curr:3d}: R = {rate:.4f}")
-
-
-
-# Define your coarse mesh files.
-mesh_files = {
-        50: "mesh5_50.vtu",
-        100: "mesh5_100.vtu",
-        200: "mesh5_200.vtu"
-}
-# Fine solution file (assumed to be the "exact" solution)
-fine_file = "mesh5_400.vtu"
-
-analyze_errors(mesh_files, fine_file)
\ No newline at end of file
+    return errors
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Relative errors and convergence rates against a fine solution.")
+    parser.add_argument("--method", default="delaunay", choices=INTERPOLATION_METHODS)
+    parser.add_argument("--workers", type=int, default=1, help="loader threads and worker processes")
+    parser.add_argument("--series", metavar="PATTERN",
+                        help="snapshot glob pattern with {N}, e.g. 'mesh5_{N}_*.vtu': per-frame errors over time")
+    parser.add_argument("--output", default="errors_series.csv", help="per-frame error table of --series")
+    args = parser.parse_args()
+
+    # Define your coarse mesh files.
+    mesh_files = {
+            50: "mesh5_50.vtu",
+            100: "mesh5_100.vtu",
+            200: "mesh5_200.vtu"
+    }
+    # Fine solution file (assumed to be the "exact" solution)
+    fine_file = "mesh5_400.vtu"
+
+    if args.series:
+        n_frames = time_series_errors({N: args.series.format(N=N) for N in mesh_files}, args.series.format(N=400),
+                                      args.output, args.method)
+        print(f"Info    : {n_frames} frames written to {args.output}")
+    else:
+        analyze_errors(mesh_files, fine_file, args.method, args.workers)
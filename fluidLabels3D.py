@@ -471,4 +471,5 @@ def visualize_bathymetry(width=160, depth=80, base_level=0.2, amplitude=0.1,
         plt.show()
 
 
-generate_3d_tests()
\ No newline at end of file
+if __name__ == "__main__":
+    generate_3d_tests()
\ No newline at end of file
@@ -1,107 +1,31 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
 import gmsh
 import numpy as np
-from math import sqrt, cos, sin, pi
-
-gmsh.initialize()
-
-# Set global mesh size (optional)
+from math import pi
+from meshCache import cached_build
+from meshConnectivity import periodic_edge_pairs, write_fvm_sidecar
+from meshDomains import BOUNDARY_TAGS, DOMAINS, PERIODIC_TASKS, TASK_LC, TASKS, alfven, brio, lc_from_N, rectangle
+from meshIO import get_gmsh_boundary_edges, get_gmsh_mesh, write_mesh_bin, write_mesh_txt
+from meshPartition import PARTITION_METHODS, partition_mesh
+from meshPartition import format_report as format_partition_report
+from meshQuality import element_quality, quality_summary
+from meshReorder import ELEMENT_ORDERS, NODE_ORDERS, format_report, reorder_mesh
+from meshSmooth import SMOOTH_METHODS, smooth_mesh
+from meshSmooth import format_report as format_smoothing_report
 
 
+def add_rectangle(x_min, x_max, y_min, y_max, lc):
+    """
+    Adds a rectangle surface to the current gmsh model (geo kernel).
 
-taskType = 103
-lc = 1e-3
-# Create geometry
-if taskType == 1:
-    N = 500
-    lc = 2 / (N * sqrt(3))
-    point1 = gmsh.model.geo.add_point(0.0, 0.0, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(1.0, 0.0, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(1.0, 0.1, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(0.0, 0.1, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 2:
-    lc = 1e-1
-    point1 = gmsh.model.geo.add_point(-3.0, -3.0, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(3.0, -3.0, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(3.0, 3.0, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(-3.0, 3.0, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 4:
-    N = 400
-    lc = 2 / (N * sqrt(3))
-    print(f"lc = {lc}")
-    point1 = gmsh.model.geo.add_point(0.0, 0.0, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(1.0, 0.0, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(1.0, 1.0, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(0.0, 1.0, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 5:
-    N = 500
-    lc = 2 / (N * sqrt(3))
-    print(f"lc = {lc}")
-    point1 = gmsh.model.geo.add_point(0.0, 0.0, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(0.5, 0.0, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(0.5, 0.5, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(0.0, 0.5, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-###The Circular Polarized Alfven Wave Test
-elif taskType == 8:
-    # N = 256
-    N = 10
-    lc = 2 / (N * sqrt(3))
-    alpha = pi / 6
-    x_max = 1/cos(alpha)
-    y_max = 1/sin(alpha)
-    print(f"lc = {lc}")
-    point1 = gmsh.model.geo.add_point(0.0, 0.0, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(x_max, 0.0, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(x_max, y_max, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(0.0, y_max, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 9:
-    N = 256
-    lc = 2 / (N * sqrt(3))
-    alpha = pi / 3
-    x_min = -1.0
-    x_max = 1.0
-    y_min = -0.5#-1.0/(2.0 * cos(alpha))
-    y_max = 0.5#1.0/(2.0 * cos(alpha))
-    print(f"lc = {lc}, y_max = {y_max}, y_min = {y_min}")
+    Returns:
+        lines (list): Tags of the bottom, right, top and left boundary curves.
+        surface (int): Tag of the plane surface.
+    """
     point1 = gmsh.model.geo.add_point(x_min, y_min, 0.0, lc)
     point2 = gmsh.model.geo.add_point(x_max, y_min, 0.0, lc)
     point3 = gmsh.model.geo.add_point(x_max, y_max, 0.0, lc)
@@ -110,108 +34,298 @@ elif taskType == 9:
     line2 = gmsh.model.geo.add_line(point2, point3)
     line3 = gmsh.model.geo.add_line(point3, point4)
     line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
     face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 102:
-    N = 150
-    lc = 2 / (N * sqrt(3))
-    alpha = pi / 3
-    x_min = 0
-    x_max = 1.0
-    y_min = 0.0  # -1.0/(2.0 * cos(alpha))
-    y_max = 1.0  # 1.0/(2.0 * cos(alpha))
-    print(f"lc = {lc}, y_max = {y_max}, y_min = {y_min}")
-    point1 = gmsh.model.geo.add_point(x_min, y_min, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(x_max, y_min, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(x_max, y_max, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(x_min, y_max, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
-
-elif taskType == 103:
-    N = 256
-    lc = 2 / (N * sqrt(3))
-    x_min = 0
-    x_max = 1.0
-    y_min = 0.0  # -1.0/(2.0 * cos(alpha))
-    y_max = 0.5  # 1.0/(2.0 * cos(alpha))
-    print(f"lc = {lc}, y_max = {y_max}, y_min = {y_min}")
-    point1 = gmsh.model.geo.add_point(x_min, y_min, 0.0, lc)
-    point2 = gmsh.model.geo.add_point(x_max, y_min, 0.0, lc)
-    point3 = gmsh.model.geo.add_point(x_max, y_max, 0.0, lc)
-    point4 = gmsh.model.geo.add_point(x_min, y_max, 0.0, lc)
-    line1 = gmsh.model.geo.add_line(point1, point2)
-    line2 = gmsh.model.geo.add_line(point2, point3)
-    line3 = gmsh.model.geo.add_line(point3, point4)
-    line4 = gmsh.model.geo.add_line(point4, point1)
-    face1 = gmsh.model.geo.add_curve_loop([line1, line2, line3, line4])
-    gmsh.model.geo.add_plane_surface([face1])
+    surface = gmsh.model.geo.add_plane_surface([face1])
+    return [line1, line2, line3, line4], surface
+
+
+def add_physical_groups(lines, surface):
+    """
+    Tags the rectangle sides (in add_rectangle order) with meshDomains.BOUNDARY_TAGS
+    and the surface as physical group 1 "domain" (after synchronize).
+    """
+    for name, line in zip(("bottom", "right", "top", "left"), lines):
+        gmsh.model.addPhysicalGroup(1, [line], BOUNDARY_TAGS[name])
+        gmsh.model.setPhysicalName(1, BOUNDARY_TAGS[name], name)
+    gmsh.model.addPhysicalGroup(2, [surface], 1)
+    gmsh.model.setPhysicalName(2, 1, "domain")
+
+
+def set_periodic(lines, domain):
+    """
+    Makes the right curve a periodic copy of the left one and the top curve a copy of
+    the bottom one (after synchronize), so opposite boundaries get identical nodes.
+
+    Returns:
+        translations (list): Master-to-slave shifts, as taken by periodic_edge_pairs.
+    """
+    bottom, right, top, left = lines
+    x_min, x_max, y_min, y_max = domain
+    translations = [(x_max - x_min, 0.0), (0.0, y_max - y_min)]
+    for slave, master, (dx, dy) in zip((right, top), (left, bottom), translations):
+        affine = [1, 0, 0, dx, 0, 1, 0, dy, 0, 0, 1, 0, 0, 0, 0, 1]
+        gmsh.model.mesh.setPeriodic(1, [slave], [master], affine)
+    return translations
+
+
+def generate_mesh(domain, lc, output, algorithm=6, coord_format="%.16f", node_order="none",
+                  element_order="none", sidecar=True, partitions=0, partition_method="rcb",
+                  threads=1, transfinite=False, recombine=False, periodic=False, smooth="none", gui=False,
+                  cache=True):
+    """
+    Meshes a rectangular domain with gmsh and exports it as <output>.txt and <output>.mshb,
+    plus the FVM connectivity/geometry sidecar <output>.fvm. Both mesh files carry the
+    $BoundaryEdges section: boundary node pairs with the physical tag of their side
+    (meshDomains.BOUNDARY_TAGS).
+
+    gmsh keeps its model in process-global state, so this function owns the whole
+    initialize/finalize cycle and must not run concurrently in one process.
+
+    Parameters:
+        domain (tuple): (x_min, x_max, y_min, y_max).
+        lc (float): Characteristic element length.
+        output (str): Output path without extension.
+        algorithm (int): gmsh 2D algorithm: 6 = Frontal-Delaunay, 1 = MeshAdapt, 5 = Delaunay,
+                         8 = Frontal-Delaunay for quads.
+        coord_format (str): Coordinate format of the text file.
+        node_order (str): Node renumbering before export, see meshReorder.NODE_ORDERS.
+        element_order (str): Element reordering before export, see meshReorder.ELEMENT_ORDERS.
+        sidecar (bool): Also write the FVM sidecar (meshConnectivity.write_fvm_sidecar).
+        partitions (int): If > 1, also write <output>.part<rank>.mshb with halo layers
+                          (meshPartition.partition_mesh).
+        partition_method (str): "rcb" or "graph".
+        threads (int): gmsh General.NumThreads and Mesh.MaxNumThreads2D (0 = all cores).
+        transfinite (bool): Structured mesh: transfinite curves with about (side / lc) segments
+                            and a transfinite surface instead of an unstructured algorithm.
+        recombine (bool): Recombine triangles into quadrilaterals (all quads on a transfinite
+                          surface; otherwise a mixed mesh, written with 3- and 4-node rows).
+        periodic (bool): Periodic meshing of opposite sides and a $PeriodicEdges table
+                         (meshConnectivity.periodic_edge_pairs) in the .txt and .mshb files.
+        smooth (str): Smooth the interior nodes of the exported arrays before reordering:
+                      "none" or one of meshSmooth.SMOOTH_METHODS (boundary nodes stay fixed).
+        gui (bool): Show the mesh in the gmsh GUI before finalizing (bypasses the cache).
+        cache (bool): Reuse a previously generated mesh with the same definition.
+
+    Returns:
+        summary (dict): Output file names, node/element counts, quality and the time
+                        spent in gmsh's mesh generation (mesh_seconds).
+    """
+    # Everything that changes the exported files; doubles as the cache key
+    options = {"lc": lc, "lc_min_factor": 0.01, "algorithm": algorithm, "coord_format": coord_format,
+               "node_order": node_order, "element_order": element_order, "sidecar": sidecar,
+               "partitions": partitions, "partition_method": partition_method, "threads": threads,
+               "transfinite": transfinite, "recombine": recombine, "periodic": periodic,
+               "smooth": smooth, "gmsh": gmsh.__version__}
+
+    def build(output):
+        return _build_mesh(domain, output, options, gui)
+
+    if gui or not cache:
+        return build(output)
+    geometry = {"domain": "rectangle", "bounds": list(domain)}
+    suffixes = (".txt", ".mshb", ".fvm") if sidecar else (".txt", ".mshb")
+    if partitions > 1:
+        suffixes += tuple(f".part{rank}.mshb" for rank in range(partitions))
+    summary, hit = cached_build("gmsh", geometry, options, output, suffixes, build)
+    return dict(summary, output=output, cached=hit)
+
+
+def _build_mesh(domain, output, options, gui):
+    lc = options["lc"]
+    gmsh.initialize()
+    try:
+        lines, surface = add_rectangle(*domain, lc)
+        if options["transfinite"]:
+            x_min, x_max, y_min, y_max = domain
+            nx = max(1, int(round((x_max - x_min) / lc)))
+            ny = max(1, int(round((y_max - y_min) / lc)))
+            for line, n in zip(lines, (nx, ny, nx, ny)):
+                gmsh.model.geo.mesh.setTransfiniteCurve(line, n + 1)
+            gmsh.model.geo.mesh.setTransfiniteSurface(surface)
+        if options["recombine"]:
+            gmsh.model.geo.mesh.setRecombine(2, surface)
+
+        gmsh.option.setNumber("Mesh.CharacteristicLengthMin", lc * options["lc_min_factor"])
+        gmsh.option.setNumber("Mesh.CharacteristicLengthMax", lc)
+        gmsh.option.setNumber("Mesh.Algorithm", options["algorithm"])
+        gmsh.option.setNumber("General.NumThreads", options["threads"])
+        gmsh.option.setNumber("Mesh.MaxNumThreads2D", options["threads"])
+
+        gmsh.model.geo.synchronize()
+        add_physical_groups(lines, surface)
+        if options["periodic"]:
+            translations = set_periodic(lines, domain)
+
+        # Generate mesh
+        start = time.perf_counter()
+        gmsh.model.mesh.generate(2)
+        mesh_seconds = time.perf_counter() - start
+
+        # Get all nodes and triangular (type 2) / quadrangle (type 3) elements as arrays
+        coords, elements = get_gmsh_mesh((2, 3) if options["recombine"] else 2)
+        boundary = get_gmsh_boundary_edges()
+        all_elem_types, all_elem_tags, _ = gmsh.model.mesh.getElements()
+        summary = {
+            "output": output,
+            "lc": lc,
+            "gmsh_elements": sum(len(tags) for tags in all_elem_tags),
+            "mesh_seconds": mesh_seconds,
+        }
+
+        # Vectorized smoothing instead of gmsh's (slow) Relocate2D/Laplace2D optimize passes
+        if options["smooth"] != "none":
+            start = time.perf_counter()
+            coords, summary["smoothing"] = smooth_mesh(coords, elements, options["smooth"])
+            summary["smoothing"]["seconds"] = time.perf_counter() - start
+
+        # Optional locality reordering (gmsh's internal order scatters neighbours in memory)
+        if options["node_order"] != "none" or options["element_order"] != "none":
+            coords, elements, summary["locality"], rank = reorder_mesh(
+                coords, elements, options["node_order"], options["element_order"], return_node_rank=True)
+            boundary[:, :2] = rank[boundary[:, :2]]
 
-gmsh.option.setNumber("Mesh.CharacteristicLengthMin", lc*0.01)
-gmsh.option.setNumber("Mesh.CharacteristicLengthMax", lc)
+        sections = {"BoundaryEdges": boundary}
+        summary["boundary_edges"] = len(boundary)
+        if options["periodic"]:
+            sections["PeriodicEdges"] = periodic_edge_pairs(coords, elements, translations)
+            summary["periodic_edges"] = len(sections["PeriodicEdges"])
 
-# Set meshing algorithm to Frontal-Delaunay
-gmsh.option.setNumber("Mesh.Algorithm", 6)  # 6 = Frontal-Delaunay, 1=MeshAdapt, 5=Delaunay
+        write_mesh_txt(f"{output}.txt", coords, elements, coord_format=options["coord_format"], sections=sections)
+        # Binary companion (full float64 precision, memory-mappable)
+        write_mesh_bin(f"{output}.mshb", coords, elements, sections)
+        if options["sidecar"]:
+            write_fvm_sidecar(f"{output}.fvm", coords, elements)
+        if options["partitions"] > 1:
+            report = partition_mesh(coords, elements, options["partitions"], output, options["partition_method"],
+                                    sections.get("PeriodicEdges"))
+            summary["partition"] = {key: report[key] for key in ("sizes", "imbalance", "edge_cut")}
+        summary["nodes"] = len(coords)
+        summary["elements"] = len(elements)
+        summary["quads"] = int(np.count_nonzero(elements[:, -1] >= 0)) if elements.shape[1] == 4 else 0
+        quality = quality_summary(element_quality(coords, elements))
+        summary["quality"] = {"min_angle": quality["min_angle"]["min"],
+                              "max_aspect_ratio": quality["aspect_ratio"]["max"],
+                              "cfl_length": quality["cfl_length_min"]}
 
-gmsh.model.geo.synchronize()
+        if gui:
+            gmsh.fltk.run()
+    finally:
+        gmsh.finalize()
+    return summary
 
 
+def _print_summary(summary):
+    source = " (from cache)" if summary.get("cached") else ""
+    print(f"Info    : Mesh exported to {summary['output']}.txt / {summary['output']}.mshb{source}")
+    print(f"GMSH: Всего элементов = {summary['gmsh_elements']}")
+    print(f"Экспорт: Треугольных элементов = {summary['elements'] - summary.get('quads', 0)} (lc = {summary['lc']})")
+    if summary.get("quads"):
+        print(f"Экспорт: Четырёхугольных элементов = {summary['quads']}")
+    if "quality" in summary:
+        quality = summary["quality"]
+        print(f"Quality: min angle = {quality['min_angle']:.2f}, max aspect ratio = {quality['max_aspect_ratio']:.3f}, "
+              f"CFL length = {quality['cfl_length']:.4e}")
+    if "periodic_edges" in summary:
+        print(f"Periodic: {summary['periodic_edges']} boundary edge pairs")
+    if "smoothing" in summary:
+        print(format_smoothing_report(summary["smoothing"]))
+    if "locality" in summary:
+        print(format_report(summary["locality"]))
+    if "partition" in summary:
+        print(format_partition_report(summary["partition"]))
 
-# Generate and optimize mesh
-gmsh.model.mesh.generate(2)
-# for _ in range(100):
-#     # gmsh.model.mesh.optimize("Netgen")
-#     gmsh.model.mesh.optimize("Relocate2D", force=True)
-#     gmsh.model.mesh.optimize("Laplace2D")
 
+def sweep(domain, Ns, output, jobs=None, **options):
+    """
+    Generates one mesh per resolution N, each in its own worker process.
 
-# Get all nodes and their coordinates
-node_tags, coords, _ = gmsh.model.mesh.getNodes()
-coords = np.array(coords).reshape(-1, 3)  # Reshape properly
+    Parameters:
+        domain (tuple): (x_min, x_max, y_min, y_max).
+        Ns (list): Resolutions; lc = 2 / (N * sqrt(3)).
+        output (str): Output path pattern containing "{N}".
+        jobs (int): Number of worker processes (default: one per CPU).
+        options: Keyword arguments of generate_mesh.
 
-# Map Gmsh node tags to 1-based indices
-node_indices = {tag: idx + 1 for idx, tag in enumerate(node_tags)}
+    Returns:
+        summaries (list): Per-resolution summaries in the order of Ns.
+    """
+    # A fresh process per mesh: gmsh state is process-global
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        futures = [pool.submit(generate_mesh, domain, lc_from_N(N), output.format(N=N), **options)
+                   for N in Ns]
+        return [future.result() for future in futures]
 
-# Get all triangular elements (type 2 in Gmsh)
-elem_tags, elem_node_tags = gmsh.model.mesh.getElementsByType(2)
-elem_node_tags = list(zip(*[iter(elem_node_tags)] * 3))  # Safe grouping
 
-# Export to .txt
-filename = f"mesh{taskType}.txt"
-with open(filename, "w") as f:
-    # Write nodes
-    f.write("$Nodes\n")
-    f.write(f"{len(node_tags)}\n")
-    for tag, (x, y, z) in zip(node_tags, coords):
-        f.write(f"{node_indices[tag]} {x:.16f} {y:.16f} 0.0\n")  # Force z=0.0 for 2D
-    f.write("$EndNodes\n")
+def main():
+    parser = argparse.ArgumentParser(description="Generate rectangular MHD test meshes with gmsh.")
+    parser.add_argument("--task", type=int, default=103, choices=sorted(TASKS),
+                        help="predefined taskType (domain and default N)")
+    parser.add_argument("--domain", choices=sorted(DOMAINS),
+                        help="parameterized domain instead of a predefined task")
+    parser.add_argument("--bounds", type=float, nargs=4, metavar=("X_MIN", "X_MAX", "Y_MIN", "Y_MAX"),
+                        help="bounds of --domain rectangle")
+    parser.add_argument("--alpha", type=float, default=pi / 6, help="rotation angle of --domain alfven")
+    parser.add_argument("-N", type=int, nargs="+", help="resolution(s); several values run a parallel sweep")
+    parser.add_argument("--lc", type=float, help="characteristic length (overrides N for a single mesh)")
+    parser.add_argument("--algorithm", type=int, default=6, help="6 = Frontal-Delaunay, 1 = MeshAdapt, 5 = Delaunay")
+    parser.add_argument("--threads", type=int, default=1, help="gmsh meshing threads (0 = all cores)")
+    parser.add_argument("--transfinite", action="store_true", help="structured transfinite mesh of the rectangle")
+    parser.add_argument("--recombine", action="store_true", help="recombine triangles into quadrilaterals")
+    parser.add_argument("--periodic", action="store_true",
+                        help=f"periodic boundaries in x and y (default for tasks {sorted(PERIODIC_TASKS)})")
+    parser.add_argument("--smooth", default="none", choices=("none",) + SMOOTH_METHODS,
+                        help="smooth interior nodes after meshing (boundary nodes stay fixed)")
+    parser.add_argument("--node-order", default="none", choices=NODE_ORDERS,
+                        help="renumber nodes before export (rcm = reverse Cuthill-McKee)")
+    parser.add_argument("--element-order", default="none", choices=ELEMENT_ORDERS,
+                        help="reorder elements before export along a space-filling curve")
+    parser.add_argument("--no-sidecar", action="store_true", help="skip the FVM connectivity sidecar (*.fvm)")
+    parser.add_argument("--partitions", type=int, default=0, help="also split the mesh into this many parts")
+    parser.add_argument("--partition-method", default="rcb", choices=PARTITION_METHODS)
+    parser.add_argument("--output", help="output path without extension; use {N} for sweeps")
+    parser.add_argument("--jobs", type=int, help="worker processes for sweeps (default: CPU count)")
+    parser.add_argument("--gui", action="store_true", help="show a single mesh in the gmsh GUI")
+    parser.add_argument("--no-cache", action="store_true", help="always regenerate instead of reusing meshCache")
+    args = parser.parse_args()
 
-    # Write elements
-    f.write("$Elements\n")
-    f.write(f"{len(elem_tags)}\n")
-    for elem_idx, nodes in enumerate(elem_node_tags, 1):
-        mapped_nodes = [node_indices[tag] for tag in nodes]
-        f.write(f"{elem_idx} 3 {' '.join(map(str, mapped_nodes))}\n")
-    f.write("$EndElements\n")
+    if args.domain == "rectangle":
+        domain = rectangle(*args.bounds) if args.bounds else rectangle()
+    elif args.domain == "alfven":
+        domain = alfven(args.alpha)
+    elif args.domain == "brio":
+        domain = brio()
+    else:
+        domain = TASKS[args.task][0]
+    name = args.domain or args.task
 
-print(f"Info    : Mesh exported to {filename}")
+    options = {"algorithm": args.algorithm, "node_order": args.node_order,
+               "element_order": args.element_order, "sidecar": not args.no_sidecar,
+               "partitions": args.partitions, "partition_method": args.partition_method,
+               "threads": args.threads, "transfinite": args.transfinite, "recombine": args.recombine,
+               "smooth": args.smooth,
+               "periodic": args.periodic or (args.domain is None and args.task in PERIODIC_TASKS),
+               "cache": not args.no_cache}
 
-all_elem_types, all_elem_tags, _ = gmsh.model.mesh.getElements()
-total_elems_gmsh = sum(len(tags) for tags in all_elem_tags)
-tri_elems_gmsh = len(gmsh.model.mesh.getElementsByType(2)[0])
+    Ns = args.N or [TASKS[args.task][1]]
+    if len(Ns) > 1 and args.lc is not None:
+        parser.error("--lc applies to a single mesh")
+    if len(Ns) > 1:
+        output = args.output or f"mesh{name}_{{N}}"
+        for summary in sweep(domain, Ns, output, jobs=args.jobs, **options):
+            _print_summary(summary)
+        return
 
-print(f"GMSH: Всего элементов = {total_elems_gmsh}")
-print(f"GMSH: Треугольных элементов = {tri_elems_gmsh}")
-print(f"Экспорт: Треугольных элементов = {len(elem_tags)}")
+    if args.lc is not None:
+        lc = args.lc
+    elif Ns[0] is not None:
+        lc = lc_from_N(Ns[0])
+    else:
+        lc = TASK_LC[args.task]
+    print(f"lc = {lc}, domain = {domain}")
+    output = (args.output or f"mesh{name}").format(N=Ns[0])
+    _print_summary(generate_mesh(domain, lc, output, gui=args.gui, **options))
 
-# Show mesh in GUI
-gmsh.fltk.run()
-gmsh.finalize()
 
+if __name__ == "__main__":
+    main()
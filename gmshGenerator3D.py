@@ -0,0 +1,187 @@
+import argparse
+import time
+
+import gmsh
+import numpy as np
+from scipy.interpolate import make_interp_spline
+
+from fluidLabels3D import BEACH_Z, L, bathymetry
+from meshCache import cached_build
+from meshIO import get_gmsh_mesh, write_mesh_bin, write_mesh_txt
+
+# Tank of fluidLabels3D.generate_solid_bathymetry_3d: x (width) and z (depth) in [0, L],
+# y (height, pointing up) in [0, TANK_HEIGHT]
+TANK_HEIGHT = 0.5
+GEOMETRIES = ("box", "trough")
+# Bathymetry samples per side of the trough bottom (add_trough)
+TROUGH_SAMPLES = 33
+# Version of the add_box/add_trough geometry definitions, part of the cache key: bump it
+# whenever they change (2: the trough bottom interpolates its samples)
+GEOMETRY_VERSION = 2
+# Voxel grid of the 3D fluid tests (width x height x depth), for comparison
+VOXEL_GRID = (160, 100, 80)
+
+
+def add_box(height=TANK_HEIGHT):
+    """Adds the tank [0, L] x [0, height] x [0, L] (OCC kernel); returns the volume tags."""
+    return [gmsh.model.occ.addBox(0.0, 0.0, 0.0, L, height, L)]
+
+
+def add_trough(height=TANK_HEIGHT, samples=TROUGH_SAMPLES):
+    """
+    Adds the fluid volume of the bathymetry tank (OCC kernel): everything in the box
+    above the bottom y = bathymetry(x, z) + BEACH_Z.
+
+    The bottom is the bicubic B-spline surface interpolating a samples x samples grid
+    of bathymetry values (gmsh takes control points, so the control net is solved for
+    first); it is extruded upwards by height and intersected with the box.
+
+    Returns:
+        volumes (list): Volume tags.
+    """
+    s = np.linspace(0.0, 1.0, samples)
+    x, z = np.meshgrid(s * L, s * L, indexing="ij")
+    y = np.vectorize(bathymetry)(x, z) + BEACH_Z
+    # Tensor-product interpolation: cubic splines through the samples along one grid
+    # direction, then through the resulting coefficients along the other
+    net = make_interp_spline(s, np.stack((x, y, z), axis=-1), k=3).c
+    spline = make_interp_spline(s, net.swapaxes(0, 1), k=3)
+    control = spline.c.swapaxes(0, 1)
+    knots, multiplicities = np.unique(spline.t, return_counts=True)
+    points = [gmsh.model.occ.addPoint(*p) for p in control.reshape(-1, 3)]
+    bottom = gmsh.model.occ.addBSplineSurface(points, samples, degreeU=3, degreeV=3,
+                                              knotsU=knots.tolist(), knotsV=knots.tolist(),
+                                              multiplicitiesU=multiplicities.tolist(),
+                                              multiplicitiesV=multiplicities.tolist())
+    extruded = gmsh.model.occ.extrude([(2, bottom)], 0.0, height, 0.0)
+    above = [(dim, tag) for dim, tag in extruded if dim == 3]
+    box = add_box(height)
+    volumes, _ = gmsh.model.occ.intersect(above, [(3, tag) for tag in box])
+    return [tag for dim, tag in volumes if dim == 3]
+
+
+def tet_quality(coords, tets):
+    """
+    Vectorized tetrahedron quality.
+
+    Returns:
+        volume (np.ndarray): Signed volumes (positive for positively oriented cells).
+        radius_ratio (np.ndarray): 3 * inradius / circumradius (1 = regular tetrahedron).
+    """
+    xyz = np.asarray(coords)[:, :3][tets]
+    u, v, w = (xyz[:, i] - xyz[:, 0] for i in (1, 2, 3))
+    det = np.einsum("ij,ij->i", u, np.cross(v, w))
+    volume = det / 6.0
+
+    faces = ((0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3))
+    area = sum(0.5 * np.linalg.norm(np.cross(xyz[:, b] - xyz[:, a], xyz[:, c] - xyz[:, a]), axis=1)
+               for a, b, c in faces)
+    inradius = 3.0 * np.abs(volume) / area
+    # Circumcentre relative to vertex 0
+    offset = ((u * u).sum(1)[:, None] * np.cross(v, w) + (v * v).sum(1)[:, None] * np.cross(w, u)
+              + (w * w).sum(1)[:, None] * np.cross(u, v)) / (2.0 * det[:, None])
+    circumradius = np.linalg.norm(offset, axis=1)
+    return volume, 3.0 * inradius / circumradius
+
+
+def generate_mesh_3d(geometry, lc, output, algorithm=10, threads=0, coord_format="%.16f", cache=True):
+    """
+    Tetrahedral mesh of a fluidLabels3D tank geometry, exported as <output>.txt and
+    <output>.mshb with 3D coordinates and 4-node cells.
+
+    Parameters:
+        geometry (str): "box" (the whole tank) or "trough" (fluid above the bathymetry).
+        lc (float): Characteristic element length.
+        output (str): Output path without extension.
+        algorithm (int): gmsh 3D algorithm: 10 = HXT (thread-parallel), 1 = Delaunay, 4 = Frontal.
+        threads (int): gmsh General.NumThreads and Mesh.MaxNumThreads3D (0 = all cores).
+        coord_format (str): Coordinate format of the text file.
+        cache (bool): Reuse a previously generated mesh with the same definition.
+
+    Returns:
+        summary (dict): Output name, node/element counts, meshing time and quality.
+    """
+    if geometry not in GEOMETRIES:
+        raise ValueError(f"Unknown geometry '{geometry}', expected one of {GEOMETRIES}.")
+    options = {"lc": lc, "algorithm": algorithm, "threads": threads, "coord_format": coord_format,
+               "gmsh": gmsh.__version__}
+
+    def build(output):
+        return _build_mesh_3d(geometry, output, options)
+
+    if not cache:
+        return build(output)
+    definition = {"geometry": geometry, "height": TANK_HEIGHT, "samples": TROUGH_SAMPLES,
+                  "version": GEOMETRY_VERSION}
+    summary, hit = cached_build("gmsh3d", definition, options, output, (".txt", ".mshb"), build)
+    return dict(summary, output=output, cached=hit)
+
+
+def _build_mesh_3d(geometry, output, options):
+    lc = options["lc"]
+    gmsh.initialize()
+    try:
+        if geometry == "box":
+            add_box()
+        else:
+            add_trough()
+        gmsh.model.occ.synchronize()
+
+        gmsh.option.setNumber("Mesh.CharacteristicLengthMin", lc * 0.01)
+        gmsh.option.setNumber("Mesh.CharacteristicLengthMax", lc)
+        gmsh.option.setNumber("Mesh.Algorithm3D", options["algorithm"])
+        gmsh.option.setNumber("General.NumThreads", options["threads"])
+        gmsh.option.setNumber("Mesh.MaxNumThreads3D", options["threads"])
+
+        start = time.perf_counter()
+        gmsh.model.mesh.generate(3)
+        mesh_seconds = time.perf_counter() - start
+
+        # 4-node tetrahedra are gmsh element type 4
+        coords, tets = get_gmsh_mesh(4)
+    finally:
+        gmsh.finalize()
+
+    write_mesh_txt(f"{output}.txt", coords, tets, coord_format=options["coord_format"], dim=3)
+    write_mesh_bin(f"{output}.mshb", coords, tets, dim=3)
+
+    volume, radius_ratio = tet_quality(coords, tets)
+    return {
+        "output": output,
+        "lc": lc,
+        "nodes": len(coords),
+        "elements": len(tets),
+        "mesh_seconds": mesh_seconds,
+        "volume": float(np.abs(volume).sum()),
+        "quality": {"min_radius_ratio": float(radius_ratio.min()),
+                    "mean_radius_ratio": float(radius_ratio.mean()),
+                    "inverted": int(np.count_nonzero(volume <= 0))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tetrahedral meshes of the fluidLabels3D tank geometries.")
+    parser.add_argument("--geometry", default="trough", choices=GEOMETRIES)
+    parser.add_argument("--lc", type=float, default=0.05, help="characteristic element length")
+    parser.add_argument("--algorithm", type=int, default=10, help="10 = HXT (parallel), 1 = Delaunay, 4 = Frontal")
+    parser.add_argument("--threads", type=int, default=0, help="meshing threads (0 = all cores)")
+    parser.add_argument("--output", help="output path without extension")
+    parser.add_argument("--no-cache", action="store_true", help="always regenerate instead of reusing meshCache")
+    args = parser.parse_args()
+
+    output = args.output or f"mesh3d_{args.geometry}"
+    summary = generate_mesh_3d(args.geometry, args.lc, output, args.algorithm, args.threads,
+                               cache=not args.no_cache)
+    source = " (from cache)" if summary.get("cached") else ""
+    print(f"Info    : Mesh exported to {output}.txt / {output}.mshb{source}")
+    print(f"Tetrahedra: {summary['elements']}, nodes: {summary['nodes']}, volume = {summary['volume']:.6f}, "
+          f"meshing {summary['mesh_seconds']:.2f} s")
+    quality = summary["quality"]
+    print(f"Quality: min radius ratio = {quality['min_radius_ratio']:.3f}, "
+          f"mean = {quality['mean_radius_ratio']:.3f}, inverted = {quality['inverted']}")
+    print(f"Voxel grid {'x'.join(map(str, VOXEL_GRID))}: {np.prod(VOXEL_GRID)} cells "
+          f"({np.prod(VOXEL_GRID) / summary['elements']:.1f}x the tetrahedra)")
+
+
+if __name__ == "__main__":
+    main()
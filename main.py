@@ -1,73 +1,84 @@
+import time
+
+import numpy as np
+import netgen
 import netgen.geom2d as geom2d
 from netgen.meshing import Mesh, FaceDescriptor, MeshingParameters
-
-# Define the geometry of a square domain [-3, 3] x [-3, 3]
-geo = geom2d.SplineGeometry()
+from meshCache import cached_build
+from meshDomains import BOUNDARY_TAGS
+from meshRefine import write_refined
 
 Brio = True
-# Define points for the square boundary
-p1 = geo.AppendPoint(-3.0, -3.0)  # Bottom-left
-p2 = geo.AppendPoint(3.0, -3.0)   # Bottom-right
-p3 = geo.AppendPoint(3.0, 3.0)    # Top-right
-p4 = geo.AppendPoint(-3.0, 3.0)   # Top-left
-refinement_steps = 5  # Number of refinement steps
+# Define points for the square boundary [-3, 3] x [-3, 3]
+corners = [(-3.0, -3.0), (3.0, -3.0), (3.0, 3.0), (-3.0, 3.0)]  # Bottom-left, bottom-right, top-right, top-left
+refinement_steps = 0  # Number of uniform 1:4 refinements of the netgen mesh
 maxh = 0.2
 if Brio:
-    p1 = geo.AppendPoint(0.0, 0.0)  # Bottom-left
-    p2 = geo.AppendPoint(1.0, 0.0)   # Bottom-right
-    p3 = geo.AppendPoint(1.0, 0.1)    # Top-right
-    p4 = geo.AppendPoint(0.0, 0.1)   # Top-left
+    corners = [(0.0, 0.0), (1.0, 0.0), (1.0, 0.1), (0.0, 0.1)]
     maxh = 0.009  # Maximum element size
-    refinement_steps = 10  # Number of refinement steps
-
-# Add boundary edges
-geo.Append(["line", p1, p2], bc="bottom")  # Bottom edge
-geo.Append(["line", p2, p3], bc="right")  # Right edge
-geo.Append(["line", p3, p4], bc="top")  # Top edge
-geo.Append(["line", p4, p1], bc="left")  # Left edge
-
-# Generate the mesh
-print("Starting to generate mesh...")
-
-ng_params = MeshingParameters(maxh=maxh, closeedges = True, optimize=True, delaunay2d = False, optsteps2d = 1000,elsizeweight = 0.3, segmentsperedge=10)
-
-mesh = geo.GenerateMesh(ng_params)
-mesh.dim = 2
-
-# Add material descriptor
-# mesh.Add(FaceDescriptor(surfnr=1, domin=1, bc=1))
-# mesh.SetMaterial(1, "mat")
-#
-# # Assign boundary conditions manually
-# for boundary_edge in mesh.Elements1D():
-#     vertices = boundary_edge.vertices
-#     boundary_edge.index = 1  # Assign boundary condition index for these edges
-
-# Apply mesh refinement for better quality
-
-# mesh.OptimizeMesh2d()
-# for _ in range(refinement_steps):
-mesh.OptimizeMesh2d(ng_params)
-
-
-# Export the mesh to a file
-filename = "meshBrio.txt"
-with open(filename, 'w') as f:
-    # Export nodes
-    f.write("$Nodes\n")
-    f.write(f"{len(mesh.Points())}\n")  # Number of vertices
-    for i, point in enumerate(mesh.Points(), start=1):
-        x, y, z = point.p
-        f.write(f"{i} {x} {y} 0.0\n")
-    f.write("$EndNodes\n")
-
-    # Export elements
-    f.write("$Elements\n")
-    f.write(f"{len(mesh.Elements2D())}\n")  # Number of 2D elements
-    for j, element in enumerate(mesh.Elements2D(), start=1):
-        vertices = " ".join(map(str, element.vertices))
-        f.write(f"{j} {len(element.vertices)} {vertices}\n")
-    f.write("$EndElements\n")
-
-print(f"Mesh exported to {filename}")
-print("All done!")
\ No newline at end of file
+    refinement_steps = 0  # Number of uniform 1:4 refinements of the netgen mesh
+
+ng_options = dict(maxh=maxh, closeedges = True, optimize=True, delaunay2d = False, optsteps2d = 1000,elsizeweight = 0.3, segmentsperedge=10)
+
+
+def build(output, options=ng_options, steps=refinement_steps):
+    # Define the geometry of the rectangular domain
+    geo = geom2d.SplineGeometry()
+    p1, p2, p3, p4 = [geo.AppendPoint(x, y) for x, y in corners]
+
+    # Add boundary edges
+    geo.Append(["line", p1, p2], bc="bottom")  # Bottom edge
+    geo.Append(["line", p2, p3], bc="right")  # Right edge
+    geo.Append(["line", p3, p4], bc="top")  # Top edge
+    geo.Append(["line", p4, p1], bc="left")  # Left edge
+
+    # Generate the mesh
+    print("Starting to generate mesh...")
+
+    ng_params = MeshingParameters(**options)
+
+    start = time.perf_counter()
+    mesh = geo.GenerateMesh(ng_params)
+    mesh.dim = 2
+
+    # Add material descriptor
+    # mesh.Add(FaceDescriptor(surfnr=1, domin=1, bc=1))
+    # mesh.SetMaterial(1, "mat")
+    #
+    # # Assign boundary conditions manually
+    # for boundary_edge in mesh.Elements1D():
+    #     vertices = boundary_edge.vertices
+    #     boundary_edge.index = 1  # Assign boundary condition index for these edges
+
+    # Apply mesh refinement for better quality
+
+    # mesh.OptimizeMesh2d()
+    # for _ in range(refinement_steps):
+    mesh.OptimizeMesh2d(ng_params)
+    mesh_seconds = time.perf_counter() - start
+
+    # Export the mesh to a file: bulk copies of netgen's point and element tables
+    coords = np.asarray(mesh.Coordinates(), dtype=np.float64)
+    surface_elements = mesh.Elements2D().NumPy()
+    if np.any(surface_elements["np"] != 3):
+        raise ValueError("Expected a triangle mesh from netgen.")
+    elements = surface_elements["nodes"][:, :3].astype(np.int64) - 1  # netgen point ids are 1-based
+    # Boundary segments with the physical tag of their bc name (only O(sqrt(n)) of them)
+    boundary = np.array([[segment.vertices[0].nr - 1, segment.vertices[1].nr - 1,
+                          BOUNDARY_TAGS[mesh.GetBCName(segment.index - 1)]] for segment in mesh.Elements1D()],
+                        dtype=np.int64).reshape(-1, 3)
+
+    # The finest level is generated and written chunk by chunk
+    summary = write_refined(output, coords, elements, steps, coord_format="%r", boundary=boundary)
+    summary["mesh_seconds"] = mesh_seconds
+    return summary
+
+
+if __name__ == "__main__":
+    # Reuse the stored mesh when geometry, netgen parameters and exporter are unchanged
+    summary, hit = cached_build("netgen", {"corners": corners}, dict(ng_options, refinement_steps=refinement_steps,
+                                                                  netgen=getattr(netgen, "__version__", None)),
+                                "meshBrio", (".txt", ".mshb"), build)
+
+    print(f"Mesh exported to meshBrio.txt{' (from cache)' if hit else ''}")
+    print("All done!")
\ No newline at end of file
@@ -0,0 +1,221 @@
+import csv
+import os
+import platform
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import get_context
+
+from meshDomains import TASKS, brio, lc_from_N
+from meshIO import read_mesh_bin
+from meshQuality import element_quality, quality_summary
+
+GMSH_ALGORITHMS = (1, 5, 6, 8)
+# Netgen variants compared against main.py's parameters (overrides of main.ng_options)
+NETGEN_VARIANTS = {
+    "main": {},
+    "delaunay": {"delaunay2d": True},
+    "optsteps3": {"optsteps2d": 3},
+}
+# main.py meshes the Brio-Wu shock tube; gmsh cases on the same domain use this name
+NETGEN_DOMAIN = "brio"
+
+COLUMNS = ("case", "generator", "domain", "N", "algorithm", "threads", "variant",
+           "wall_seconds", "mesh_seconds", "peak_rss_mb", "nodes", "elements",
+           "min_angle", "mean_min_angle", "max_aspect_ratio", "cfl_length")
+KEY_COLUMNS = ("generator", "domain", "N", "algorithm", "threads", "variant")
+
+
+def case_name(case):
+    """Stable identifier of a benchmark case, used to match results against a baseline."""
+    return "/".join(str(case[column]) for column in KEY_COLUMNS)
+
+
+def benchmark_cases(tasks, Ns, algorithms=GMSH_ALGORITHMS, threads=(1,), netgen_variants=()):
+    """
+    Cartesian product of the gmsh settings over the task domains and resolutions, plus
+    the netgen variants on main.py's geometry.
+
+    Parameters:
+        tasks (list): gmshGenerator task ids (domains from meshDomains.TASKS).
+        Ns (list): Resolutions; lc = maxh = 2 / (N * sqrt(3)).
+        algorithms (tuple): gmsh Mesh.Algorithm values.
+        threads (tuple): gmsh General.NumThreads / Mesh.MaxNumThreads2D values.
+        netgen_variants (tuple): Names from NETGEN_VARIANTS; empty skips netgen.
+
+    Returns:
+        cases (list): Dicts with the KEY_COLUMNS fields.
+    """
+    cases = [{"generator": "gmsh", "domain": task, "N": N, "algorithm": algorithm, "threads": n_threads,
+              "variant": ""}
+             for task, N, algorithm, n_threads in product(tasks, Ns, algorithms, threads)]
+    cases += [{"generator": "netgen", "domain": NETGEN_DOMAIN, "N": N, "algorithm": "", "threads": 1,
+               "variant": variant}
+              for N, variant in product(Ns, netgen_variants)]
+    return cases
+
+
+def _domain(name):
+    return brio() if name == NETGEN_DOMAIN else TASKS[int(name)][0]
+
+
+def run_case(case, workdir):
+    """
+    Meshes one case and measures it. Meant to run in a fresh process (see run_benchmark),
+    so that the peak RSS belongs to this case alone.
+
+    Returns:
+        row (dict): The case fields plus the COLUMNS measurements.
+    """
+    output = os.path.join(workdir, case_name(case).replace("/", "_"))
+    lc = lc_from_N(case["N"])
+
+    start = time.perf_counter()
+    if case["generator"] == "gmsh":
+        from gmshGenerator import generate_mesh
+
+        summary = generate_mesh(_domain(case["domain"]), lc, output, algorithm=case["algorithm"],
+                                sidecar=False, threads=case["threads"], cache=False)
+    else:
+        import main
+
+        options = dict(main.ng_options, maxh=lc, **NETGEN_VARIANTS[case["variant"]])
+        summary = main.build(output, options, steps=0)
+    wall_seconds = time.perf_counter() - start
+
+    # Quality from the exported file, identically for every generator
+    nodes, elements = read_mesh_bin(f"{output}.mshb")
+    quality = quality_summary(element_quality(nodes, elements))
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024 ** 2 if platform.system() == "Darwin" else 1024)
+
+    return dict(case, case=case_name(case), wall_seconds=wall_seconds, mesh_seconds=summary["mesh_seconds"],
+                peak_rss_mb=peak_rss_mb, nodes=len(nodes), elements=len(elements),
+                min_angle=quality["min_angle"]["min"], mean_min_angle=quality["min_angle"]["mean"],
+                max_aspect_ratio=quality["aspect_ratio"]["max"], cfl_length=quality["cfl_length_min"])
+
+
+def run_benchmark(cases, repeat=1, jobs=1, workdir=None):
+    """
+    Runs every case repeat times, each run in its own spawned process, and keeps the
+    fastest run of every case. jobs > 1 runs cases concurrently, which distorts timings
+    of multi-threaded cases; keep the default for reference numbers.
+
+    Returns:
+        rows (list): One run_case row per case, in the order of cases.
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp, \
+            ProcessPoolExecutor(max_workers=jobs, mp_context=get_context("spawn"),
+                                max_tasks_per_child=1) as pool:
+        futures = [[pool.submit(run_case, case, tmp) for _ in range(repeat)] for case in cases]
+        rows = []
+        for runs in futures:
+            results = [future.result() for future in runs]
+            rows.append(min(results, key=lambda row: row["wall_seconds"]))
+    return rows
+
+
+def write_results(filename, rows):
+    """Writes benchmark rows as CSV with the COLUMNS header."""
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_results(filename):
+    """Reads a CSV written by write_results; returns {case: row} with numeric measurements."""
+    with open(filename, newline="") as f:
+        rows = {}
+        for row in csv.DictReader(f):
+            for column in COLUMNS[COLUMNS.index("wall_seconds"):]:
+                row[column] = float(row[column])
+            rows[row["case"]] = row
+        return rows
+
+
+def compare_results(rows, baseline, time_tolerance=0.2, rss_tolerance=0.2, element_tolerance=0.02,
+                    angle_tolerance=1.0, min_seconds=0.05):
+    """
+    Flags regressions of rows against a baseline from read_results.
+
+    A case regresses if it is slower than (1 + time_tolerance) times the baseline (and by
+    more than min_seconds), uses more than (1 + rss_tolerance) times the peak RSS, changes
+    its element count by more than element_tolerance (relative), or loses more than
+    angle_tolerance degrees of minimum angle.
+
+    Returns:
+        regressions (list): Human-readable messages, one per regressed measurement.
+        missing (list): Cases without a baseline entry.
+    """
+    regressions, missing = [], []
+    for row in rows:
+        base = baseline.get(row["case"])
+        if base is None:
+            missing.append(row["case"])
+            continue
+        if (row["wall_seconds"] > base["wall_seconds"] * (1 + time_tolerance)
+                and row["wall_seconds"] - base["wall_seconds"] > min_seconds):
+            regressions.append(f"{row['case']}: wall time {base['wall_seconds']:.3f} s -> {row['wall_seconds']:.3f} s")
+        if row["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append(f"{row['case']}: peak RSS {base['peak_rss_mb']:.1f} MB -> {row['peak_rss_mb']:.1f} MB")
+        if abs(row["elements"] - base["elements"]) > element_tolerance * base["elements"]:
+            regressions.append(f"{row['case']}: elements {base['elements']:.0f} -> {row['elements']}")
+        if row["min_angle"] < base["min_angle"] - angle_tolerance:
+            regressions.append(f"{row['case']}: min angle {base['min_angle']:.2f} -> {row['min_angle']:.2f}")
+    return regressions, missing
+
+
+def format_results(rows):
+    """Fixed-width results table, fastest case per domain and N first."""
+    lines = [f"{'case':<32} {'wall s':>8} {'mesh s':>8} {'RSS MB':>8} {'elements':>10} "
+             f"{'min angle':>9} {'max AR':>8}"]
+    for row in sorted(rows, key=lambda row: (str(row["domain"]), row["N"], row["wall_seconds"])):
+        lines.append(f"{row['case']:<32} {row['wall_seconds']:8.3f} {row['mesh_seconds']:8.3f} "
+                     f"{row['peak_rss_mb']:8.1f} {row['elements']:10d} {row['min_angle']:9.2f} "
+                     f"{row['max_aspect_ratio']:8.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark gmsh algorithms/threads and netgen parameters.")
+    parser.add_argument("--task", type=int, nargs="+", default=[103], choices=sorted(TASKS),
+                        help="gmshGenerator task domains")
+    parser.add_argument("-N", type=int, nargs="+", default=[64, 128, 256], help="resolutions")
+    parser.add_argument("--algorithm", type=int, nargs="+", default=list(GMSH_ALGORITHMS))
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count()])
+    parser.add_argument("--netgen", nargs="*", default=[], choices=sorted(NETGEN_VARIANTS),
+                        help="netgen variants on main.py's geometry (none by default)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument("--jobs", type=int, default=1, help="concurrent cases (distorts timings)")
+    parser.add_argument("--output", default="benchmark.csv", help="results table (CSV)")
+    parser.add_argument("--baseline", help="CSV of a previous run to check for regressions")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--time-tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    cases = benchmark_cases(args.task, args.N, tuple(args.algorithm), tuple(sorted(set(args.threads))),
+                            tuple(args.netgen))
+    print(f"Info    : {len(cases)} cases x {args.repeat} runs")
+    rows = run_benchmark(cases, args.repeat, args.jobs)
+    write_results(args.output, rows)
+    if args.save_baseline:
+        write_results(args.save_baseline, rows)
+    print(format_results(rows))
+    print(f"Info    : results written to {args.output}")
+
+    if args.baseline:
+        regressions, missing = compare_results(rows, read_results(args.baseline), args.time_tolerance)
+        for case in missing:
+            print(f"Warning : no baseline for {case}")
+        for message in regressions:
+            print(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+        print("Info    : no regressions against the baseline")
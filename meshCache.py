@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from meshIO import EXPORTER_VERSION
+
+# Cache location and size bound can be overridden through the environment
+CACHE_DIR = os.environ.get("MESHGEN_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "meshGen"))
+CACHE_MAX_BYTES = int(os.environ.get("MESHGEN_CACHE_MAX_BYTES", 4 * 1024 ** 3))
+META_FILE = "meta.json"
+
+
+def cache_key(generator, geometry, options):
+    """
+    Hashes everything that determines a generated mesh file.
+
+    Parameters:
+        generator (str): Name of the generator ("gmsh", "netgen", ...).
+        geometry (dict): JSON-serializable geometry definition.
+        options (dict): JSON-serializable meshing and export options.
+
+    Returns:
+        key (str): Hex SHA-256 digest.
+    """
+    definition = {
+        "generator": generator,
+        "geometry": geometry,
+        "options": options,
+        "exporter": EXPORTER_VERSION,
+    }
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+
+def _entry_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def cache_entries(cache_dir=CACHE_DIR):
+    """
+    Lists cache entries, least recently used first.
+
+    Returns:
+        entries (list): Dicts with key, size (bytes), last_used (epoch seconds) and the stored metadata.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for entry in os.scandir(cache_dir):
+        meta_path = os.path.join(entry.path, META_FILE)
+        if not entry.is_dir() or not os.path.exists(meta_path):
+            continue
+        with open(meta_path) as f:
+            meta = json.load(f)
+        entries.append({
+            "key": entry.name,
+            "size": _entry_size(entry.path),
+            "last_used": os.stat(meta_path).st_mtime,
+            "meta": meta,
+        })
+    return sorted(entries, key=lambda e: e["last_used"])
+
+
+def evict(max_bytes=CACHE_MAX_BYTES, cache_dir=CACHE_DIR):
+    """Removes least recently used entries until the cache fits in max_bytes."""
+    entries = cache_entries(cache_dir)
+    total = sum(e["size"] for e in entries)
+    for e in entries:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(os.path.join(cache_dir, e["key"]), ignore_errors=True)
+        total -= e["size"]
+
+
+def purge(keys=None, older_than=None, cache_dir=CACHE_DIR):
+    """
+    Removes cache entries.
+
+    Parameters:
+        keys (list): Keys (or unique key prefixes) to remove; all entries if None.
+        older_than (float): Only remove entries unused for this many seconds.
+
+    Returns:
+        removed (int): Number of removed entries.
+    """
+    now = time.time()
+    removed = 0
+    for e in cache_entries(cache_dir):
+        if keys is not None and not any(e["key"].startswith(k) for k in keys):
+            continue
+        if older_than is not None and now - e["last_used"] < older_than:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, e["key"]), ignore_errors=True)
+        removed += 1
+    return removed
+
+
+def cached_build(generator, geometry, options, output, suffixes, build,
+                 cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Returns a cached mesh if one exists for the same definition, otherwise builds and stores it.
+
+    Parameters:
+        generator, geometry, options: Cache key inputs, see cache_key.
+        output (str): Output path without extension.
+        suffixes (tuple): Extensions of the files build writes, e.g. (".txt", ".mshb").
+        build (callable): build(output) writes output + suffix for every suffix and
+                          returns a JSON-serializable summary.
+
+    Returns:
+        summary (dict): The summary returned by build (stored on a miss).
+        hit (bool): Whether the files were copied from the cache.
+    """
+    key = cache_key(generator, geometry, options)
+    entry = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry, META_FILE)
+
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        for suffix in suffixes:
+            shutil.copyfile(os.path.join(entry, "mesh" + suffix), output + suffix)
+        os.utime(meta_path)  # LRU timestamp
+        return meta["summary"], True
+
+    summary = build(output)
+
+    # Stage the entry next to its final place and rename it in, so concurrent
+    # sweeps never see a partially written entry
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix=".staging-")
+    try:
+        for suffix in suffixes:
+            shutil.copyfile(output + suffix, os.path.join(staging, "mesh" + suffix))
+        with open(os.path.join(staging, META_FILE), "w") as f:
+            json.dump({"generator": generator, "geometry": geometry, "options": options,
+                       "exporter": EXPORTER_VERSION, "summary": summary}, f, indent=2)
+        os.rename(staging, entry)
+    except OSError:
+        # Another process stored the same entry first
+        shutil.rmtree(staging, ignore_errors=True)
+    evict(max_bytes, cache_dir)
+    return summary, False
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and purge the generated mesh cache.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list entries, least recently used first")
+    purge_parser = commands.add_parser("purge", help="remove entries")
+    purge_parser.add_argument("keys", nargs="*", help="key prefixes to remove (default: all)")
+    purge_parser.add_argument("--older-than", type=float, metavar="DAYS", help="only entries unused for DAYS")
+    evict_parser = commands.add_parser("evict", help="shrink the cache to a size bound")
+    evict_parser.add_argument("--max-bytes", type=int, default=CACHE_MAX_BYTES)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        entries = cache_entries(args.cache_dir)
+        for e in entries:
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(e["last_used"]))
+            meta = e["meta"]
+            print(f"{e['key'][:12]}  {e['size'] / 1024 ** 2:9.2f} MiB  {used}  "
+                  f"{meta['generator']} {json.dumps(meta['geometry'])} {json.dumps(meta['options'])}")
+        print(f"{len(entries)} entries, {sum(e['size'] for e in entries) / 1024 ** 2:.2f} MiB in {args.cache_dir}")
+    elif args.command == "purge":
+        older_than = args.older_than * 86400 if args.older_than is not None else None
+        removed = purge(args.keys or None, older_than, args.cache_dir)
+        print(f"Removed {removed} entries from {args.cache_dir}")
+    elif args.command == "evict":
+        evict(args.max_bytes, args.cache_dir)
@@ -0,0 +1,209 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from meshIO import read_arrays_bin, write_arrays_bin
+from meshSubmesh import edge_keys, element_edges
+
+
+def build_edges(n_nodes, elements):
+    """
+    Builds the unique edge table of a mesh of k-gons.
+
+    Edges keep the orientation they have in their left (lower-index) cell; boundary
+    edges have right cell -1. Padded slots of mixed-cell connectivity get edge -1.
+
+    Returns:
+        edge_nodes (np.ndarray): (n_edges, 2) node indices.
+        edge_cells (np.ndarray): (n_edges, 2) left and right cell (-1 on the boundary).
+        elem_edges (np.ndarray): (n_elems, k) edge index of every local edge.
+    """
+    elements = np.asarray(elements)
+    n_elems, k = elements.shape
+    local = element_edges(elements)
+    slots = np.flatnonzero(local[:, 0] >= 0)
+    keys = edge_keys(local[slots], n_nodes)
+
+    ranked = np.argsort(keys, kind="stable")
+    sorted_keys = keys[ranked]
+    order = slots[ranked]  # local edge slot of every sorted key
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    edge_id = np.cumsum(first) - 1
+
+    elem_edges = np.full(len(local), -1, dtype=np.int64)
+    elem_edges[order] = edge_id
+    n_edges = int(edge_id[-1]) + 1 if len(edge_id) else 0
+
+    owner = order // k  # cell of every sorted local edge
+    edge_cells = np.full((n_edges, 2), -1, dtype=np.int64)
+    edge_cells[:, 0] = owner[first]
+    second = ~first
+    if np.any(second[1:] & second[:-1]):
+        raise ValueError("Non-manifold mesh: an edge is shared by more than two cells.")
+    edge_cells[edge_id[second], 1] = owner[second]
+
+    edge_nodes = local[order[first]]
+    return edge_nodes, edge_cells, elem_edges.reshape(n_elems, k)
+
+
+def element_neighbors(edge_cells, elem_edges):
+    """(n_elems, k) cell across every local edge, -1 on the boundary (and in padded slots)."""
+    cells = edge_cells[elem_edges]
+    own = np.arange(len(elem_edges))[:, None]
+    return np.where(elem_edges < 0, -1, np.where(cells[..., 0] == own, cells[..., 1], cells[..., 0]))
+
+
+def node_to_elements(n_nodes, elements):
+    """
+    Node-to-element incidence in CSR form.
+
+    Returns:
+        offsets (np.ndarray): (n_nodes + 1,) start of every node's cell list.
+        indices (np.ndarray): Cell indices, grouped by node and ascending within a node.
+    """
+    elements = np.asarray(elements)
+    slots = np.flatnonzero(elements.ravel() >= 0)
+    flat = elements.ravel()[slots]
+    order = np.argsort(flat, kind="stable")
+    offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=n_nodes), out=offsets[1:])
+    return offsets, slots[order] // elements.shape[1]
+
+
+def cell_geometry(coords, elements):
+    """
+    Areas and centroids of k-gon cells (shoelace formula). Padded slots of mixed-cell
+    connectivity repeat the first node, which adds nothing to the sums.
+
+    Returns:
+        area (np.ndarray): (n_elems,) cell areas (positive regardless of orientation).
+        centroid (np.ndarray): (n_elems, 2) cell centroids.
+    """
+    elements = np.asarray(elements)
+    elements = np.where(elements < 0, elements[:, :1], elements)
+    xy = np.asarray(coords)[:, :2][elements]
+    x, y = xy[..., 0], xy[..., 1]
+    x1, y1 = np.roll(x, -1, axis=1), np.roll(y, -1, axis=1)
+    cross = x * y1 - x1 * y
+    signed_area = 0.5 * cross.sum(axis=1)
+    centroid = np.stack((((x + x1) * cross).sum(axis=1), ((y + y1) * cross).sum(axis=1)), axis=1)
+    centroid /= 6.0 * signed_area[:, None]
+    return np.abs(signed_area), centroid
+
+
+def edge_geometry(coords, edge_nodes, edge_cells, centroid):
+    """
+    Lengths, midpoints and unit normals of the edges; normals point from the left
+    cell to the right cell (outward on the boundary).
+    """
+    xy = np.asarray(coords)[:, :2]
+    a = xy[edge_nodes[:, 0]]
+    b = xy[edge_nodes[:, 1]]
+    d = b - a
+    length = np.hypot(d[:, 0], d[:, 1])
+    midpoint = 0.5 * (a + b)
+    normal = np.stack((d[:, 1], -d[:, 0]), axis=1) / length[:, None]
+    outward = np.einsum("ij,ij->i", normal, midpoint - centroid[edge_cells[:, 0]]) >= 0
+    normal[~outward] *= -1
+    return length, midpoint, normal
+
+
+def periodic_edge_pairs(coords, elements, translations, tol=1e-8):
+    """
+    Pairs boundary edges across periodic boundaries: a "slave" edge is matched to the
+    "master" edge it coincides with after shifting the master by a translation.
+    Matching goes through a KD-tree of the boundary edge midpoints, O(n log n).
+
+    Parameters:
+        coords (np.ndarray): Node coordinates.
+        elements (np.ndarray): Connectivity with 0-based node indices.
+        translations (list): (dx, dy) vectors from master to slave side, e.g. [(Lx, 0), (0, Ly)].
+        tol (float): Matching tolerance relative to the largest domain extent.
+
+    Returns:
+        pairs (np.ndarray): (n_pairs, 6) int64 rows of slave node a, slave node b,
+                            master node a, master node b (a and b matched node to node),
+                            slave cell, master cell.
+    """
+    xy = np.asarray(coords)[:, :2]
+    edge_nodes, edge_cells, _ = build_edges(len(xy), elements)
+    boundary = np.flatnonzero(edge_cells[:, 1] < 0)
+    nodes = edge_nodes[boundary]
+    midpoint = 0.5 * (xy[nodes[:, 0]] + xy[nodes[:, 1]])
+    tree = cKDTree(midpoint)
+    eps = tol * np.ptp(xy, axis=0).max()
+
+    tables = []
+    for translation in translations:
+        distance, master = tree.query(midpoint - np.asarray(translation, dtype=np.float64),
+                                      distance_upper_bound=eps)
+        slave = np.flatnonzero(np.isfinite(distance))
+        master = master[slave]
+        slave_nodes = nodes[slave]
+        master_nodes = nodes[master]
+        # Orient the master edge like the slave edge
+        shifted = xy[master_nodes[:, 0]] + translation
+        flip = np.hypot(*(shifted - xy[slave_nodes[:, 0]]).T) > eps
+        master_nodes[flip] = master_nodes[flip][:, ::-1]
+        tables.append(np.concatenate((slave_nodes, master_nodes,
+                                      edge_cells[boundary[slave], :1], edge_cells[boundary[master], :1]), axis=1))
+    return np.concatenate(tables) if tables else np.empty((0, 6), dtype=np.int64)
+
+
+def fvm_connectivity(coords, elements):
+    """
+    Computes everything the finite-volume solver derives from the raw cell list.
+
+    Returns:
+        arrays (dict): edge_nodes, edge_cells, elem_edges, elem_neighbors,
+                       node_elem_offsets, node_elem_indices, cell_area, cell_centroid,
+                       edge_length, edge_midpoint, edge_normal. For mixed-cell meshes
+                       elem_edges and elem_neighbors are -1 in the padded slots.
+    """
+    coords = np.asarray(coords)
+    elements = np.asarray(elements)
+    n_nodes = len(coords)
+
+    edge_nodes, edge_cells, elem_edges = build_edges(n_nodes, elements)
+    offsets, indices = node_to_elements(n_nodes, elements)
+    area, centroid = cell_geometry(coords, elements)
+    length, midpoint, normal = edge_geometry(coords, edge_nodes, edge_cells, centroid)
+    return {
+        "edge_nodes": edge_nodes.astype(np.int32),
+        "edge_cells": edge_cells.astype(np.int32),
+        "elem_edges": elem_edges.astype(np.int32),
+        "elem_neighbors": element_neighbors(edge_cells, elem_edges).astype(np.int32),
+        "node_elem_offsets": offsets,
+        "node_elem_indices": indices.astype(np.int32),
+        "cell_area": area,
+        "cell_centroid": centroid,
+        "edge_length": length,
+        "edge_midpoint": midpoint,
+        "edge_normal": normal,
+    }
+
+
+def write_fvm_sidecar(filename, coords, elements):
+    """Writes fvm_connectivity(coords, elements) in the meshIO binary format (*.fvm)."""
+    write_arrays_bin(filename, fvm_connectivity(coords, elements))
+
+
+def read_fvm_sidecar(filename):
+    """Memory-maps a sidecar written by write_fvm_sidecar; returns a dict of arrays."""
+    return read_arrays_bin(filename)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from meshIO import read_mesh_bin, read_mesh_txt
+
+    parser = argparse.ArgumentParser(description="Write the FVM connectivity/geometry sidecar of a mesh.")
+    parser.add_argument("mesh", help="input mesh (*.txt or *.mshb)")
+    parser.add_argument("sidecar", nargs="?", help="output file (default: <mesh>.fvm)")
+    args = parser.parse_args()
+
+    nodes, elements = (read_mesh_bin if args.mesh.endswith(".mshb") else read_mesh_txt)(args.mesh)
+    sidecar = args.sidecar or args.mesh.rsplit(".", 1)[0] + ".fvm"
+    write_fvm_sidecar(sidecar, nodes, elements)
+    print(f"Info    : FVM sidecar written to {sidecar}")
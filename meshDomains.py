@@ -0,0 +1,43 @@
+from math import sqrt, cos, sin, pi
+
+
+# ===== Parameterized domains =====
+# Every domain is an axis-aligned rectangle given as (x_min, x_max, y_min, y_max).
+def rectangle(x_min=0.0, x_max=1.0, y_min=0.0, y_max=1.0):
+    """Axis-aligned rectangle [x_min, x_max] x [y_min, y_max]."""
+    return (x_min, x_max, y_min, y_max)
+
+
+def alfven(alpha=pi / 6):
+    """Domain of the circularly polarized Alfven wave test rotated by angle alpha."""
+    return (0.0, 1 / cos(alpha), 0.0, 1 / sin(alpha))
+
+
+def brio(length=1.0, width=0.1):
+    """Shock tube of the Brio-Wu test."""
+    return (0.0, length, 0.0, width)
+
+
+def lc_from_N(N):
+    """Characteristic length giving roughly N equilateral triangles per unit length."""
+    return 2 / (N * sqrt(3))
+
+
+DOMAINS = {"rectangle": rectangle, "alfven": alfven, "brio": brio}
+
+# taskType -> (domain, default N); task 2 uses a fixed lc instead of N
+TASKS = {
+    1: (brio(), 500),
+    2: (rectangle(-3.0, 3.0, -3.0, 3.0), None),
+    4: (rectangle(), 400),
+    5: (rectangle(0.0, 0.5, 0.0, 0.5), 500),
+    8: (alfven(), 10),  # N = 256
+    9: (rectangle(-1.0, 1.0, -0.5, 0.5), 256),
+    102: (rectangle(), 150),
+    103: (rectangle(0.0, 1.0, 0.0, 0.5), 256),
+}
+TASK_LC = {2: 1e-1}
+# Physical tags of the rectangle sides, shared by the gmsh and netgen exporters
+BOUNDARY_TAGS = {"bottom": 1, "right": 2, "top": 3, "left": 4}
+# Tasks with periodic boundaries in x and y (Alfven wave, vortex)
+PERIODIC_TASKS = {8, 9}
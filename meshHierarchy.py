@@ -0,0 +1,161 @@
+import numpy as np
+
+from meshConnectivity import periodic_edge_pairs, write_fvm_sidecar
+from meshDomains import PERIODIC_TASKS, TASKS, lc_from_N
+from meshIO import read_arrays_bin, read_mesh_bin, write_arrays_bin, write_mesh_bin, write_mesh_txt
+from meshRefine import refine_uniform
+
+
+def hierarchy_file(output, N):
+    """Path of the parent maps of a family whose coarsest mesh is output.format(N=N)."""
+    return f"{output.format(N=N)}.hier.mshb"
+
+
+def generate_hierarchy(domain, N, levels, output, coord_format="%.16f", sidecar=True, periodic=False,
+                       **gmsh_options):
+    """
+    Nested mesh family: the coarsest mesh (resolution N) is meshed once with gmsh, every
+    finer level (2N, 4N, ...) is a uniform 1:4 refinement of the previous one
+    (meshRefine.refine_uniform). Levels are written as output.format(N=...) .txt/.mshb
+    (and .fvm) with the $BoundaryEdges (and $PeriodicEdges) sections; the parent cell
+    maps go to hierarchy_file(output, N) as arrays "parent_<N>" (one per refined level).
+
+    Children of cell i are cells 4i..4i+3 of the next level, so every level keeps the
+    cell locality of the coarsest one.
+
+    Parameters:
+        domain (tuple): (x_min, x_max, y_min, y_max).
+        N (int): Resolution of the coarsest level (lc = lc_from_N(N)).
+        levels (int): Number of refined levels after the coarsest one.
+        output (str): Output path pattern containing "{N}".
+        coord_format (str): Coordinate format of the text files.
+        sidecar (bool): Also write the FVM sidecars.
+        periodic (bool): Periodic coarsest mesh; the refined levels stay periodic.
+        gmsh_options: Further keyword arguments of gmshGenerator.generate_mesh for the
+                      coarsest level (triangle meshes only: no recombine).
+
+    Returns:
+        summaries (list): Per-level dicts with output, N, node and element counts.
+    """
+    from gmshGenerator import generate_mesh
+
+    coarse = output.format(N=N)
+    summary = generate_mesh(domain, lc_from_N(N), coarse, coord_format=coord_format, sidecar=sidecar,
+                            periodic=periodic, **gmsh_options)
+    coords, elements, sections = read_mesh_bin(f"{coarse}.mshb", return_sections=True)
+    boundary = sections["BoundaryEdges"]
+    summaries = [{"output": coarse, "N": N, "nodes": summary["nodes"], "elements": summary["elements"]}]
+
+    x_min, x_max, y_min, y_max = domain
+    translations = [(x_max - x_min, 0.0), (0.0, y_max - y_min)]
+    parents = {}
+    for level in range(1, levels + 1):
+        N_level = N * 2 ** level
+        coords, elements, parent, boundary = refine_uniform(coords, elements, boundary)
+        parents[f"parent_{N_level}"] = parent.astype(np.int32)
+
+        level_output = output.format(N=N_level)
+        level_sections = {"BoundaryEdges": boundary}
+        if periodic:
+            level_sections["PeriodicEdges"] = periodic_edge_pairs(coords, elements, translations)
+        write_mesh_txt(f"{level_output}.txt", coords, elements, coord_format=coord_format,
+                       sections=level_sections)
+        write_mesh_bin(f"{level_output}.mshb", coords, elements, level_sections)
+        if sidecar:
+            write_fvm_sidecar(f"{level_output}.fvm", coords, elements)
+        summaries.append({"output": level_output, "N": N_level, "nodes": len(coords), "elements": len(elements)})
+
+    parents["N"] = np.array([s["N"] for s in summaries], dtype=np.int64)
+    write_arrays_bin(hierarchy_file(output, N), parents)
+    return summaries
+
+
+def read_hierarchy(filename):
+    """
+    Reads the parent maps written by generate_hierarchy.
+
+    Returns:
+        Ns (list): Resolutions of the levels, coarsest first.
+        parents (dict): N of a refined level -> (n_cells,) parent cell on the level below.
+    """
+    arrays = read_arrays_bin(filename)
+    Ns = [int(N) for N in arrays["N"]]
+    return Ns, {N: arrays[f"parent_{N}"] for N in Ns[1:]}
+
+
+def parent_map(Ns, parents, fine, coarse):
+    """Composes the parent maps from level fine down to the coarser level coarse (both given by N)."""
+    if Ns.index(fine) <= Ns.index(coarse):
+        raise ValueError(f"Level N = {fine} is not finer than N = {coarse}.")
+    parent = parents[fine]
+    for N in reversed(Ns[Ns.index(coarse) + 1:Ns.index(fine)]):
+        parent = parents[N][parent]
+    return parent
+
+
+def restrict(values, parent, n_coarse=None, weights=None):
+    """
+    Restriction of cell values to the parent level: the weighted mean over the children.
+
+    Uniform 1:4 refinement splits a triangle into four of equal area, so the unweighted
+    mean (weights=None) is the exact cell average; pass cell areas for other nestings.
+
+    Parameters:
+        values (np.ndarray): Fine cell values of shape (n_fine,) or (n_fine, n_vars).
+        parent (np.ndarray): (n_fine,) parent cell (see parent_map for several levels).
+        n_coarse (int): Number of parent cells (default: parent.max() + 1).
+        weights (np.ndarray): Optional (n_fine,) cell weights, e.g. areas.
+
+    Returns:
+        coarse (np.ndarray): Parent cell values of shape (n_coarse,) or (n_coarse, n_vars).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_coarse = int(parent.max()) + 1 if n_coarse is None else n_coarse
+    weights = np.ones(len(parent)) if weights is None else np.asarray(weights, dtype=np.float64)
+    total = np.bincount(parent, weights, minlength=n_coarse)
+    columns = values.reshape(len(values), -1)
+    coarse = np.stack([np.bincount(parent, weights * column, minlength=n_coarse) / total
+                       for column in columns.T], axis=1)
+    return coarse.reshape((n_coarse,) + values.shape[1:])
+
+
+def prolong(values, parent):
+    """Prolongation of cell values to the children (injection: each child takes its parent's value)."""
+    return np.asarray(values)[parent]
+
+
+def relative_error(coarse_values, fine_values, parent, var_index):
+    """
+    analyzer.compute_relative_error for nested levels: the fine solution is restricted
+    to the coarse cells exactly instead of being interpolated at the cell centres.
+
+    Returns:
+        rel_error (float): sum(|psi_coarse - psi_fine_restricted|) / sum(|psi_fine_restricted|).
+    """
+    psi_fine = restrict(np.asarray(fine_values)[:, var_index], parent, len(coarse_values))
+    error_sum = np.sum(np.abs(np.asarray(coarse_values)[:, var_index] - psi_fine))
+    abs_sum = np.sum(np.abs(psi_fine))
+    return error_sum / abs_sum if abs_sum != 0 else np.nan
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Nested mesh family: one gmsh mesh plus uniform 1:4 refinements.")
+    parser.add_argument("--task", type=int, default=103, choices=sorted(TASKS))
+    parser.add_argument("-N", type=int, default=50, help="resolution of the coarsest level")
+    parser.add_argument("--levels", type=int, default=3, help="refined levels (N, 2N, 4N, ...)")
+    parser.add_argument("--algorithm", type=int, default=6, help="gmsh 2D algorithm of the coarsest level")
+    parser.add_argument("--output", help="output path pattern with {N}")
+    parser.add_argument("--no-sidecar", action="store_true")
+    parser.add_argument("--no-cache", action="store_true", help="always regenerate the coarsest level")
+    args = parser.parse_args()
+
+    output = args.output or f"mesh{args.task}_{{N}}"
+    summaries = generate_hierarchy(TASKS[args.task][0], args.N, args.levels, output, sidecar=not args.no_sidecar,
+                                   periodic=args.task in PERIODIC_TASKS, algorithm=args.algorithm,
+                                   cache=not args.no_cache)
+    for summary in summaries:
+        print(f"Info    : N = {summary['N']}: {summary['elements']} triangles, {summary['nodes']} nodes "
+              f"-> {summary['output']}.txt / .mshb")
+    print(f"Info    : parent maps written to {hierarchy_file(output, args.N)}")
@@ -0,0 +1,513 @@
+from itertools import chain, islice
+
+import numpy as np
+
+# Bump whenever the bytes written for the same input change (invalidates meshCache)
+EXPORTER_VERSION = 2
+
+# Rows formatted per `%` call; bounds the size of the intermediate strings
+CHUNK_ROWS = 1 << 16
+
+# Extra integer sections written after $Elements -> number of leading columns that hold
+# 0-based node/cell indices (written 1-based, -1 becomes 0); other columns are written as is
+SECTION_INDEX_COLUMNS = {
+    "PeriodicEdges": 6,
+    "BoundaryEdges": 2,
+}
+
+
+def remap_node_tags(node_tags, elem_node_tags, nodes_per_elem=3):
+    """
+    Converts gmsh node tags in the element connectivity to 0-based node indices
+    using a dense lookup array instead of a {tag: idx} dictionary.
+
+    Parameters:
+        node_tags (array-like): Node tags in the order the nodes are written.
+        elem_node_tags (array-like): Flat or (n_elems, k) array of element node tags.
+        nodes_per_elem (int): Nodes per element, used when elem_node_tags is flat.
+
+    Returns:
+        elements (np.ndarray): Array of shape (n_elems, k) with 0-based node indices.
+    """
+    node_tags = np.asarray(node_tags, dtype=np.int64)
+    elem_node_tags = np.asarray(elem_node_tags, dtype=np.int64).reshape(-1, nodes_per_elem)
+
+    lookup = np.full(node_tags.max() + 1, -1, dtype=np.int64)
+    lookup[node_tags] = np.arange(len(node_tags))
+    elements = lookup[elem_node_tags]
+    if np.any(elements < 0):
+        raise ValueError("Element connectivity references a node tag that was not exported.")
+    return elements
+
+
+def _chunks(array):
+    for start in range(0, len(array), CHUNK_ROWS):
+        yield array[start:start + CHUNK_ROWS]
+
+
+def write_mesh_txt(filename, coords, elements, coord_format="%.16f", sections=None, dim=2):
+    """
+    Writes a mesh in the $Nodes/$Elements text format:
+
+        $Nodes
+        n_nodes
+        <idx> <x> <y> 0.0           (<idx> <x> <y> <z> for dim=3)
+        $EndNodes
+        $Elements
+        n_elems
+        <idx> <nodes_per_elem> <n1> ... <n_k>
+        $EndElements
+
+    Node and element indices in the file are 1-based. Rows of mixed-cell meshes
+    (e.g. recombined triangles and quads) have as many node columns as their cell.
+    Optional integer tables follow as "$<Name> / count / <idx> <values> / $End<Name>"
+    blocks (see SECTION_INDEX_COLUMNS).
+
+    Parameters:
+        filename (str): Output file path.
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3);
+                             only x and y are written unless dim=3.
+        elements (np.ndarray): Connectivity of shape (n_elems, k) with 0-based node indices;
+                               smaller cells of a mixed mesh are padded with trailing -1.
+        coord_format (str): printf-style format of a single coordinate
+                            ("%.16f" for gmshGenerator, "%.6f" for femNet/meshzooGenerator,
+                            "%r" for the netgen exporter).
+        sections (dict): Optional extra tables, name -> 2D integer array (e.g. "PeriodicEdges").
+        dim (int): 2, or 3 for volume meshes (e.g. 4-node tetrahedra).
+    """
+    elements = np.asarray(elements)
+    write_mesh_txt_stream(filename, len(coords), _chunks(np.asarray(coords)),
+                          len(elements), _chunks(elements), elements.shape[1], coord_format, sections, dim)
+
+
+def write_mesh_txt_stream(filename, n_nodes, coord_chunks, n_elems, elem_chunks, nodes_per_elem=3,
+                          coord_format="%.16f", sections=None, dim=2):
+    """
+    Writes the same file as write_mesh_txt from iterables of coordinate and 0-based
+    connectivity chunks, so the full arrays never have to exist in memory.
+
+    Parameters:
+        n_nodes, n_elems (int): Total counts (written in the section headers).
+        coord_chunks (iterable): Arrays of shape (rows, >= dim).
+        elem_chunks (iterable): Arrays of shape (rows, nodes_per_elem), -1 padded for mixed cells.
+    """
+    node_format = "%d " + " ".join([coord_format] * dim) + (" 0.0\n" if dim == 2 else "\n")
+    elem_format = " ".join(["%d"] * (nodes_per_elem + 2)) + "\n"
+
+    with open(filename, "w") as f:
+        f.write("$Nodes\n")
+        f.write(f"{n_nodes}\n")
+        written = 0
+        for chunk in coord_chunks:
+            rows = np.empty((len(chunk), dim + 1), dtype=np.float64)
+            rows[:, 0] = np.arange(written + 1, written + len(chunk) + 1)
+            rows[:, 1:] = np.asarray(chunk, dtype=np.float64)[:, :dim]
+            f.write((node_format * len(rows)) % tuple(rows.ravel().tolist()))
+            written += len(rows)
+        if written != n_nodes:
+            raise ValueError(f"Expected {n_nodes} nodes, got {written}.")
+        f.write("$EndNodes\n")
+
+        f.write("$Elements\n")
+        f.write(f"{n_elems}\n")
+        written = 0
+        for chunk in elem_chunks:
+            rows = np.empty((len(chunk), nodes_per_elem + 2), dtype=np.int64)
+            rows[:, 0] = np.arange(written + 1, written + len(chunk) + 1)
+            rows[:, 2:] = chunk
+            rows[:, 1] = np.count_nonzero(rows[:, 2:] >= 0, axis=1)
+            rows[:, 2:] += 1
+            if np.all(rows[:, 1] == nodes_per_elem):
+                f.write((elem_format * len(rows)) % tuple(rows.ravel().tolist()))
+            else:
+                # Mixed cells: format every cell size in bulk, then restore the row order
+                lines = np.empty(len(rows), dtype=object)
+                for k in np.unique(rows[:, 1]):
+                    selected = rows[:, 1] == k
+                    block = rows[selected, :k + 2]
+                    row_format = " ".join(["%d"] * (k + 2)) + "\n"
+                    lines[selected] = ((row_format * len(block)) % tuple(block.ravel().tolist())).splitlines(True)
+                f.write("".join(lines))
+            written += len(rows)
+        if written != n_elems:
+            raise ValueError(f"Expected {n_elems} elements, got {written}.")
+        f.write("$EndElements\n")
+
+        for name, table in (sections or {}).items():
+            _write_section(f, name, table)
+
+
+def _write_section(f, name, table):
+    table = np.asarray(table, dtype=np.int64).reshape(len(table), -1)
+    rows = np.empty((len(table), table.shape[1] + 1), dtype=np.int64)
+    rows[:, 0] = np.arange(1, len(table) + 1)
+    rows[:, 1:] = table
+    rows[:, 1:1 + SECTION_INDEX_COLUMNS.get(name, 0)] += 1
+    row_format = " ".join(["%d"] * rows.shape[1]) + "\n"
+    f.write(f"${name}\n")
+    f.write(f"{len(rows)}\n")
+    for start in range(0, len(rows), CHUNK_ROWS):
+        block = rows[start:start + CHUNK_ROWS]
+        f.write((row_format * len(block)) % tuple(block.ravel().tolist()))
+    f.write(f"$End{name}\n")
+
+
+def get_gmsh_mesh(elem_type=2):
+    """
+    Pulls the current gmsh model's nodes and elements as numpy arrays.
+
+    Parameters:
+        elem_type (int or tuple): gmsh element type(s) (2 = 3-node triangle, 3 = 4-node quad).
+                                  With several types present, cells are listed type by type
+                                  and smaller cells are padded with trailing -1.
+
+    Returns:
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 3).
+        elements (np.ndarray): Connectivity with 0-based node indices.
+    """
+    import gmsh
+
+    node_tags, coords, _ = gmsh.model.mesh.getNodes()
+    coords = np.asarray(coords).reshape(-1, 3)
+    blocks = []
+    for single_type in np.atleast_1d(elem_type):
+        _, _, _, nodes_per_elem, _, _ = gmsh.model.mesh.getElementProperties(int(single_type))
+        _, elem_node_tags = gmsh.model.mesh.getElementsByType(int(single_type))
+        if len(elem_node_tags) or len(blocks) == 0:
+            blocks.append(remap_node_tags(node_tags, elem_node_tags, nodes_per_elem))
+    return coords, pad_cells(blocks)
+
+
+def get_gmsh_boundary_edges():
+    """
+    Pulls the 2-node line elements of every 1D physical group of the current gmsh model.
+
+    Returns:
+        edges (np.ndarray): (n_edges, 3) int64 rows of node a, node b (0-based, in the
+                            node order of get_gmsh_mesh) and the physical tag.
+    """
+    import gmsh
+
+    node_tags, _, _ = gmsh.model.mesh.getNodes()
+    tables = [np.empty((0, 3), dtype=np.int64)]
+    for dim, tag in gmsh.model.getPhysicalGroups(1):
+        for entity in gmsh.model.getEntitiesForPhysicalGroup(dim, tag):
+            _, line_node_tags = gmsh.model.mesh.getElementsByType(1, entity)
+            pairs = remap_node_tags(node_tags, line_node_tags, 2)
+            tables.append(np.column_stack((pairs, np.full(len(pairs), tag, dtype=np.int64))))
+    return np.concatenate(tables)
+
+
+def pad_cells(blocks):
+    """Stacks connectivity blocks with different node counts, padding smaller cells with -1."""
+    width = max(block.shape[1] for block in blocks)
+    return np.concatenate([np.pad(block, ((0, 0), (0, width - block.shape[1])), constant_values=-1)
+                           for block in blocks])
+
+
+# ===== Binary mesh format =====
+# 64-byte header, then a table of contents with one 64-byte entry per array,
+# then the raw little-endian array data, each array aligned to 64 bytes.
+BIN_MAGIC = b"MESHGENB"
+BIN_VERSION = 1
+BIN_ALIGN = 64
+BIN_HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("n_arrays", "<u4"), ("reserved", "V48")])
+BIN_TOC_DTYPE = np.dtype([("name", "S24"), ("dtype", "S4"), ("ndim", "<u4"),
+                          ("shape", "<u8", (2,)), ("offset", "<u8"), ("reserved", "V8")])
+
+
+def _align(offset):
+    return -(-offset // BIN_ALIGN) * BIN_ALIGN
+
+
+def _bin_layout(specs):
+    """Header, TOC and total size for a {name: (shape, dtype)} mapping."""
+    header = np.zeros(1, dtype=BIN_HEADER_DTYPE)
+    header["magic"] = BIN_MAGIC
+    header["version"] = BIN_VERSION
+    header["n_arrays"] = len(specs)
+
+    toc = np.zeros(len(specs), dtype=BIN_TOC_DTYPE)
+    offset = _align(BIN_HEADER_DTYPE.itemsize + BIN_TOC_DTYPE.itemsize * len(specs))
+    for entry, (name, (shape, dtype)) in zip(toc, specs.items()):
+        if len(shape) not in (1, 2):
+            raise ValueError(f"Array '{name}' must be 1D or 2D, got {len(shape)}D.")
+        entry["name"] = name.encode("ascii")
+        entry["dtype"] = dtype.str.encode("ascii")
+        entry["ndim"] = len(shape)
+        entry["shape"][:len(shape)] = shape
+        entry["offset"] = offset
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)))
+    return header, toc, offset
+
+
+def write_arrays_bin(filename, arrays):
+    """
+    Writes named 1D/2D arrays into a single memory-mappable binary file.
+
+    Parameters:
+        filename (str): Output file path.
+        arrays (dict): Mapping of array name (at most 24 ASCII characters) to np.ndarray.
+    """
+    arrays = {name: np.ascontiguousarray(a, dtype=np.asarray(a).dtype.newbyteorder("<"))
+              for name, a in arrays.items()}
+    header, toc, size = _bin_layout({name: (a.shape, a.dtype) for name, a in arrays.items()})
+
+    with open(filename, "wb") as f:
+        f.write(header.tobytes())
+        f.write(toc.tobytes())
+        for entry, a in zip(toc, arrays.values()):
+            f.seek(int(entry["offset"]))
+            f.write(a.tobytes())
+        f.truncate(size)
+
+
+def create_arrays_bin(filename, specs):
+    """
+    Preallocates a file in the write_arrays_bin format and maps it for writing, so that
+    arrays larger than memory can be filled in place, block by block.
+
+    Parameters:
+        filename (str): Output file path.
+        specs (dict): Mapping of array name to (shape, dtype).
+
+    Returns:
+        arrays (dict): Mapping of array name to a writable np.memmap view into the file;
+                       flush them (or drop the references) when done.
+    """
+    specs = {name: (tuple(shape), np.dtype(dtype).newbyteorder("<")) for name, (shape, dtype) in specs.items()}
+    header, toc, size = _bin_layout(specs)
+
+    with open(filename, "wb") as f:
+        f.write(header.tobytes())
+        f.write(toc.tobytes())
+        f.truncate(size)
+
+    buf = np.memmap(filename, dtype=np.uint8, mode="r+")
+    arrays = {}
+    for entry, (name, (shape, dtype)) in zip(toc, specs.items()):
+        start = int(entry["offset"])
+        arrays[name] = buf[start:start + dtype.itemsize * int(np.prod(shape))].view(dtype).reshape(shape)
+    return arrays
+
+
+def read_arrays_bin(filename):
+    """
+    Opens a file written by write_arrays_bin without reading the array data.
+
+    Parameters:
+        filename (str): Path to the binary file.
+
+    Returns:
+        arrays (dict): Mapping of array name to a read-only np.memmap view into the file.
+    """
+    buf = np.memmap(filename, dtype=np.uint8, mode="r")
+    header = buf[:BIN_HEADER_DTYPE.itemsize].view(BIN_HEADER_DTYPE)[0]
+    if header["magic"] != BIN_MAGIC:
+        raise ValueError(f"{filename} is not a binary mesh file.")
+    if header["version"] > BIN_VERSION:
+        raise ValueError(f"{filename} has unsupported version {header['version']}.")
+
+    toc_end = BIN_HEADER_DTYPE.itemsize + BIN_TOC_DTYPE.itemsize * int(header["n_arrays"])
+    toc = buf[BIN_HEADER_DTYPE.itemsize:toc_end].view(BIN_TOC_DTYPE)
+
+    arrays = {}
+    for entry in toc:
+        dtype = np.dtype(entry["dtype"].decode("ascii"))
+        shape = tuple(int(n) for n in entry["shape"][:entry["ndim"]])
+        start = int(entry["offset"])
+        nbytes = dtype.itemsize * int(np.prod(shape))
+        arrays[entry["name"].decode("ascii")] = buf[start:start + nbytes].view(dtype).reshape(shape)
+    return arrays
+
+
+def write_mesh_bin(filename, coords, elements, sections=None, dim=2):
+    """
+    Writes a mesh in the binary format: float64 node coordinates of shape (n_nodes, dim)
+    and int32 connectivity of shape (n_elems, k) with 0-based node indices
+    (-1 padded for mixed-cell meshes, as in write_mesh_txt).
+
+    Parameters:
+        filename (str): Output file path (conventionally *.mshb).
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3).
+        elements (np.ndarray): Connectivity with 0-based node indices.
+        sections (dict): Optional extra integer tables as in write_mesh_txt, stored under
+                         their section names with 0-based indices.
+        dim (int): Number of coordinates stored per node (3 for volume meshes).
+    """
+    arrays = {
+        "nodes": np.asarray(coords, dtype=np.float64)[:, :dim],
+        "elements": np.asarray(elements, dtype=np.int32),
+    }
+    for name, table in (sections or {}).items():
+        arrays[name] = np.asarray(table, dtype=np.int32).reshape(len(table), -1)
+    write_arrays_bin(filename, arrays)
+
+
+def read_mesh_bin(filename, return_sections=False):
+    """
+    Memory-maps a mesh written by write_mesh_bin; nothing is copied until accessed.
+
+    Returns:
+        nodes (np.memmap): Node coordinates of shape (n_nodes, 2), or (n_nodes, 3) for volume meshes.
+        elements (np.memmap): Connectivity of shape (n_elems, k) with 0-based node indices.
+        sections (dict): Only if return_sections: the extra tables by section name.
+    """
+    arrays = read_arrays_bin(filename)
+    if return_sections:
+        sections = {name: a for name, a in arrays.items() if name not in ("nodes", "elements")}
+        return arrays["nodes"], arrays["elements"], sections
+    return arrays["nodes"], arrays["elements"]
+
+
+def _expect_line(f, expected, filename):
+    line = f.readline().strip()
+    if line != expected:
+        raise ValueError(f"{filename}: expected '{expected}', got '{line}'.")
+
+
+def _parse_rows(lines, dtype):
+    """
+    Parses whitespace-separated rows in bulk with np.loadtxt; rows of different
+    lengths (mixed cells) are right-padded with zeros.
+    """
+    try:
+        return np.loadtxt(lines, dtype=dtype, ndmin=2)
+    except ValueError:
+        tokens = [line.split() for line in lines]
+        widths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        block = np.zeros((len(tokens), widths.max()), dtype=dtype)
+        block[np.arange(widths.max()) < widths[:, None]] = np.array(list(chain.from_iterable(tokens)), dtype=dtype)
+        return block
+
+
+def _read_section(f, filename, section, dtype, chunk_rows, convert, fill=None, header=True):
+    """
+    Reads one "$<section> / count / rows / $End<section>" block in chunks of
+    chunk_rows lines, parsing each chunk in bulk with np.loadtxt and storing
+    convert(chunk) into a preallocated output array.
+
+    With fill set, chunks may differ in width: narrower rows are padded with fill
+    (the output is widened if a later chunk is wider). header=False means the
+    "$<section>" line has already been consumed.
+
+    Returns:
+        out (np.ndarray or None): Concatenated converted chunks; None for an empty section.
+    """
+    if header:
+        _expect_line(f, f"${section}", filename)
+    n_rows = int(f.readline())
+    out = None
+    start = 0
+    while start < n_rows:
+        lines = list(islice(f, min(chunk_rows, n_rows - start)))
+        n_data = next((i for i, line in enumerate(lines) if line.startswith("$")), len(lines))
+        if n_data == 0 or n_data < len(lines):
+            raise ValueError(f"{filename}: ${section} declares {n_rows} rows, found {start + n_data}.")
+        block = _parse_rows(lines, dtype)
+        if not np.array_equal(block[:, 0], np.arange(start + 1, start + len(block) + 1)):
+            raise ValueError(f"{filename}: ${section} indices are not consecutive from 1.")
+        block = convert(block)
+        if out is None:
+            out = np.empty((n_rows, block.shape[1]), dtype=block.dtype)
+            if fill is not None:
+                out.fill(fill)
+        elif block.shape[1] != out.shape[1]:
+            if fill is None:
+                raise ValueError(f"{filename}: inconsistent column count in ${section}.")
+            if block.shape[1] > out.shape[1]:
+                wider = np.full((n_rows, block.shape[1]), fill, dtype=out.dtype)
+                wider[:start, :out.shape[1]] = out[:start]
+                out = wider
+        out[start:start + len(block), :block.shape[1]] = block
+        start += len(block)
+    if f.readline().strip() != f"$End{section}":
+        raise ValueError(f"{filename}: ${section} declares {n_rows} rows, but more were found.")
+    return out
+
+
+def _element_columns(block, filename):
+    # Node ids are >= 1; zeros are the padding of shorter (mixed-cell) rows
+    if not np.array_equal(block[:, 2:] > 0, np.arange(block.shape[1] - 2) < block[:, 1:2]):
+        raise ValueError(f"{filename}: element node counts do not match the connectivity columns.")
+    return block[:, 2:] - 1
+
+
+def _section_columns(block, name):
+    table = block[:, 1:]
+    table[:, :SECTION_INDEX_COLUMNS.get(name, 0)] -= 1
+    return table
+
+
+def read_mesh_txt(filename, chunk_rows=CHUNK_ROWS, return_sections=False, dim=2):
+    """
+    Reads a mesh in the $Nodes/$Elements text format, chunk_rows lines at a time,
+    so the peak memory is the output arrays plus one chunk.
+
+    Parameters:
+        filename (str): Path to the mesh file.
+        chunk_rows (int): Number of lines parsed per chunk.
+        return_sections (bool): Also parse the extra sections after $Elements
+                                (otherwise they are not read at all).
+        dim (int): Coordinates to keep per node (3 for volume meshes).
+
+    Returns:
+        nodes (np.ndarray): Node coordinates of shape (n_nodes, dim).
+        elements (np.ndarray): Connectivity of shape (n_elems, k) with 0-based node indices;
+                               in mixed-cell meshes smaller cells are padded with -1.
+        sections (dict): Only if return_sections: section name -> integer table, with
+                         0-based indices in the SECTION_INDEX_COLUMNS columns.
+    """
+    sections = {}
+    with open(filename) as f:
+        nodes = _read_section(f, filename, "Nodes", np.float64, chunk_rows, lambda block: block[:, 1:dim + 1])
+        elements = _read_section(f, filename, "Elements", np.int64, chunk_rows,
+                                 lambda block: _element_columns(block, filename), fill=-1)
+        while return_sections:
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("$"):
+                raise ValueError(f"{filename}: expected a section header, got '{line}'.")
+            name = line[1:]
+            table = _read_section(f, filename, name, np.int64, chunk_rows,
+                                  lambda block: _section_columns(block, name), header=False)
+            sections[name] = table if table is not None else np.empty((0, 0), dtype=np.int64)
+    if nodes is None:
+        nodes = np.empty((0, dim), dtype=np.float64)
+    if elements is None:
+        elements = np.empty((0, 3), dtype=np.int64)
+    if len(elements) and elements.max() >= len(nodes):
+        raise ValueError(f"{filename}: element connectivity references a missing node.")
+    if return_sections:
+        return nodes, elements, sections
+    return nodes, elements
+
+
+def convert_mesh(src, dst, coord_format="%.16f"):
+    """
+    Converts a mesh between the text (*.txt) and binary (*.mshb) formats;
+    the direction is chosen by the destination extension.
+    """
+    read = read_mesh_bin if src.endswith(".mshb") else read_mesh_txt
+    nodes, elements, sections = read(src, return_sections=True)
+    if dst.endswith(".mshb"):
+        write_mesh_bin(dst, nodes, elements, sections)
+    else:
+        write_mesh_txt(dst, nodes, elements, coord_format=coord_format, sections=sections)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert meshes between the text and binary formats.")
+    parser.add_argument("src", help="input mesh (*.txt or *.mshb)")
+    parser.add_argument("dst", help="output mesh (*.txt or *.mshb)")
+    parser.add_argument("--coord-format", default="%.16f", help="coordinate format for text output")
+    args = parser.parse_args()
+
+    convert_mesh(args.src, args.dst, coord_format=args.coord_format)
+    print(f"Info    : {args.src} -> {args.dst}")
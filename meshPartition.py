@@ -0,0 +1,253 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import breadth_first_order
+
+from meshConnectivity import build_edges, cell_geometry, element_neighbors
+from meshIO import write_arrays_bin
+from meshSubmesh import edge_keys
+
+PARTITION_METHODS = ("rcb", "graph")
+
+
+def element_adjacency(edge_cells, n_elems, periodic_cells=None):
+    """
+    Symmetric element-to-element adjacency (CSR) through shared edges, plus the
+    (n, 2) cell pairs periodic_cells coupled across periodic boundaries.
+    """
+    interior = edge_cells[edge_cells[:, 1] >= 0]
+    if periodic_cells is not None:
+        interior = np.concatenate((interior, periodic_cells))
+    rows = np.concatenate((interior[:, 0], interior[:, 1]))
+    cols = np.concatenate((interior[:, 1], interior[:, 0]))
+    return coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n_elems, n_elems)).tocsr()
+
+
+def _recursive_bisection(n_items, n_parts, order_of):
+    """
+    Splits items into n_parts by recursive bisection; order_of(idx) returns the items idx
+    in the order along which to cut. Part sizes are proportional for any n_parts.
+    """
+    parts = np.zeros(n_items, dtype=np.int64)
+    stack = [(np.arange(n_items), 0, n_parts)]
+    while stack:
+        idx, first, k = stack.pop()
+        if k == 1:
+            parts[idx] = first
+            continue
+        k_left = k // 2
+        n_left = int(round(len(idx) * k_left / k))
+        ordered = idx[order_of(idx, n_left)]
+        stack.append((ordered[:n_left], first, k_left))
+        stack.append((ordered[n_left:], first + k_left, k - k_left))
+    return parts
+
+
+def rcb_partition(points, n_parts):
+    """Recursive coordinate bisection: cuts the longest extent at the proportional quantile."""
+    points = np.asarray(points)
+
+    def order_of(idx, n_left):
+        pts = points[idx]
+        values = pts[:, np.argmax(np.ptp(pts, axis=0))]
+        if 0 < n_left < len(idx):
+            return np.argpartition(values, n_left)
+        return np.argsort(values, kind="stable")
+
+    return _recursive_bisection(len(points), n_parts, order_of)
+
+
+def _level_order(adjacency):
+    """Breadth-first order starting from a pseudo-peripheral vertex of every component."""
+    n = adjacency.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    orders = []
+    while not visited.all():
+        start = int(np.argmin(visited))
+        # Two BFS sweeps find a vertex far from the rest of its component
+        for _ in range(2):
+            order = breadth_first_order(adjacency, start, directed=False, return_predecessors=False)
+            start = int(order[-1])
+        order = breadth_first_order(adjacency, start, directed=False, return_predecessors=False)
+        visited[order] = True
+        orders.append(order)
+    return np.concatenate(orders)
+
+
+def graph_partition(adjacency, n_parts):
+    """
+    Recursive graph bisection on the element adjacency: each piece is cut in two
+    along its breadth-first level structure, which keeps parts connected and the cut short.
+    """
+    def order_of(idx, n_left):
+        return _level_order(adjacency[idx][:, idx])
+
+    return _recursive_bisection(adjacency.shape[0], n_parts, order_of)
+
+
+def periodic_neighbors(neighbors, edge_nodes, elem_edges, periodic, n_nodes):
+    """
+    Copy of element_neighbors output in which the boundary slots of periodic edges
+    (a $PeriodicEdges table, see meshConnectivity.periodic_edge_pairs) hold the cell
+    on the other side of the periodic boundary.
+    """
+    neighbors = neighbors.copy()
+    # build_edges numbers edges in ascending key order
+    keys = edge_keys(edge_nodes, n_nodes)
+    for nodes, cell, other in ((periodic[:, 0:2], periodic[:, 4], periodic[:, 5]),
+                               (periodic[:, 2:4], periodic[:, 5], periodic[:, 4])):
+        edge = np.searchsorted(keys, edge_keys(nodes, n_nodes))
+        slot = np.argmax(elem_edges[cell] == edge[:, None], axis=1)
+        neighbors[cell, slot] = other
+    return neighbors
+
+
+def partition_quality(parts, edge_cells, n_parts, periodic_cells=None):
+    """
+    Returns:
+        report (dict): part sizes, load imbalance (max / mean size) and edge cut
+                       (interior and periodic edges whose cells lie in different parts).
+    """
+    sizes = np.bincount(parts, minlength=n_parts)
+    interior = edge_cells[edge_cells[:, 1] >= 0]
+    if periodic_cells is not None:
+        interior = np.concatenate((interior, periodic_cells))
+    return {
+        "sizes": sizes.tolist(),
+        "imbalance": float(sizes.max() / sizes.mean()),
+        "edge_cut": int(np.count_nonzero(parts[interior[:, 0]] != parts[interior[:, 1]])),
+    }
+
+
+def build_part(coords, elements, neighbors, parts, rank, periodic=None):
+    """
+    Local mesh of one part: owned cells, then a one-cell halo of edge neighbours
+    owned by other parts, grouped by owner rank (ascending global index within a rank).
+    For periodic meshes neighbors must include the periodic neighbours (periodic_neighbors).
+
+    Returns:
+        arrays (dict): nodes, elements (local numbering), global_elements, global_nodes,
+                       n_owned, neighbor_ranks, recv_offsets, recv_indices,
+                       send_offsets, send_indices. Cells listed for a neighbour rank in
+                       send_indices appear in the same order in that rank's recv_indices.
+                       With a periodic table also PeriodicEdges: the pairs with an owned
+                       cell on either side, in local node and cell numbering.
+    """
+    owned = np.flatnonzero(parts == rank)
+    around = neighbors[owned].ravel()
+    around = np.unique(around[around >= 0])
+    halo = around[parts[around] != rank]
+    halo = halo[np.lexsort((halo, parts[halo]))]
+    cells = np.concatenate((owned, halo))
+
+    local_cell = np.full(len(parts), -1, dtype=np.int64)
+    local_cell[cells] = np.arange(len(cells))
+
+    local_elements = elements[cells]
+    global_nodes, local_elements = np.unique(local_elements, return_inverse=True)
+    local_elements = local_elements.reshape(len(cells), -1)
+
+    neighbor_ranks = np.unique(parts[halo])
+    recv_counts = np.array([np.count_nonzero(parts[halo] == q) for q in neighbor_ranks], dtype=np.int64)
+    recv_indices = len(owned) + np.arange(len(halo))
+
+    # Owned cells that sit in another rank's halo: owned cells with an edge neighbour there
+    owned_neighbors = neighbors[owned]
+    send_lists = []
+    for q in neighbor_ranks:
+        touches = ((owned_neighbors >= 0) & (parts[np.maximum(owned_neighbors, 0)] == q)).any(axis=1)
+        send_lists.append(local_cell[owned[touches]])
+    send_counts = np.array([len(s) for s in send_lists], dtype=np.int64)
+
+    arrays = {
+        "nodes": np.asarray(coords, dtype=np.float64)[global_nodes, :2],
+        "elements": local_elements.astype(np.int32),
+        "global_elements": cells.astype(np.int64),
+        "global_nodes": global_nodes.astype(np.int64),
+        "n_owned": np.array([len(owned)], dtype=np.int64),
+        "neighbor_ranks": neighbor_ranks.astype(np.int32),
+        "recv_offsets": np.concatenate(([0], np.cumsum(recv_counts))),
+        "recv_indices": recv_indices.astype(np.int32),
+        "send_offsets": np.concatenate(([0], np.cumsum(send_counts))),
+        "send_indices": (np.concatenate(send_lists) if send_lists else np.empty(0)).astype(np.int32),
+    }
+    if periodic is not None:
+        # Both cells of such a pair are local (owned or halo), and so are their nodes
+        pairs = periodic[(parts[periodic[:, 4]] == rank) | (parts[periodic[:, 5]] == rank)]
+        local_pairs = np.concatenate((np.searchsorted(global_nodes, pairs[:, :4]), local_cell[pairs[:, 4:]]), axis=1)
+        arrays["PeriodicEdges"] = local_pairs.astype(np.int32)
+    return arrays
+
+
+def partition_mesh(coords, elements, n_parts, output, method="rcb", periodic=None):
+    """
+    Splits a mesh into n_parts and writes <output>.part<rank>.mshb for every rank
+    (meshIO binary format, see build_part for the arrays).
+
+    Parameters:
+        coords (np.ndarray): Node coordinates.
+        elements (np.ndarray): Connectivity with 0-based node indices.
+        n_parts (int): Number of parts (MPI ranks).
+        output (str): Output path without extension.
+        method (str): "rcb" (recursive coordinate bisection of the centroids) or
+                      "graph" (recursive bisection of the element adjacency graph).
+        periodic (np.ndarray): Optional $PeriodicEdges table (meshConnectivity.periodic_edge_pairs);
+                               cells across periodic boundaries are then neighbours for the
+                               graph cut, the halos and the exchange lists.
+
+    Returns:
+        report (dict): partition_quality of the result plus the written file names.
+    """
+    coords = np.asarray(coords)
+    elements = np.asarray(elements)
+    if elements.size and elements.min() < 0:
+        raise ValueError("Partitioning does not support mixed-cell (padded) connectivity.")
+    edge_nodes, edge_cells, elem_edges = build_edges(len(coords), elements)
+    neighbors = element_neighbors(edge_cells, elem_edges)
+    periodic_cells = None
+    if periodic is not None:
+        periodic = np.asarray(periodic, dtype=np.int64)
+        periodic_cells = periodic[:, 4:6]
+        neighbors = periodic_neighbors(neighbors, edge_nodes, elem_edges, periodic, len(coords))
+
+    if method == "rcb":
+        _, centroid = cell_geometry(coords, elements)
+        parts = rcb_partition(centroid, n_parts)
+    elif method == "graph":
+        parts = graph_partition(element_adjacency(edge_cells, len(elements), periodic_cells), n_parts)
+    else:
+        raise ValueError(f"Unknown partition method '{method}', expected one of {PARTITION_METHODS}.")
+
+    files = []
+    for rank in range(n_parts):
+        filename = f"{output}.part{rank}.mshb"
+        write_arrays_bin(filename, build_part(coords, elements, neighbors, parts, rank, periodic))
+        files.append(filename)
+
+    report = partition_quality(parts, edge_cells, n_parts, periodic_cells)
+    report["files"] = files
+    return report
+
+
+def format_report(report):
+    sizes = report["sizes"]
+    return (f"Parts: {len(sizes)}, cells per part {min(sizes)}..{max(sizes)}, "
+            f"load imbalance = {report['imbalance']:.4f}, edge cut = {report['edge_cut']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from meshIO import read_mesh_bin, read_mesh_txt
+
+    parser = argparse.ArgumentParser(description="Split a mesh into parts with halo layers for MPI runs.")
+    parser.add_argument("mesh", help="input mesh (*.txt or *.mshb)")
+    parser.add_argument("parts", type=int, help="number of parts")
+    parser.add_argument("--method", default="rcb", choices=PARTITION_METHODS)
+    parser.add_argument("--output", help="output path without extension (default: mesh name)")
+    args = parser.parse_args()
+
+    nodes, elements, sections = (read_mesh_bin if args.mesh.endswith(".mshb") else read_mesh_txt)(
+        args.mesh, return_sections=True)
+    report = partition_mesh(nodes, elements, args.parts, args.output or args.mesh.rsplit(".", 1)[0], args.method,
+                            sections.get("PeriodicEdges"))
+    print(format_report(report))
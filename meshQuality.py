@@ -0,0 +1,125 @@
+import numpy as np
+
+from meshConnectivity import cell_geometry
+from meshSubmesh import element_sizes
+
+# Default histogram bin edges
+ANGLE_BINS = np.arange(0.0, 181.0, 5.0)
+ASPECT_BINS = np.array([1.0, 1.1, 1.25, 1.5, 2.0, 3.0, 5.0, 10.0, np.inf])
+EDGE_RATIO_BINS = np.array([1.0, 1.1, 1.25, 1.5, 2.0, 3.0, 5.0, 10.0, np.inf])
+
+
+def element_quality(coords, elements):
+    """
+    Computes per-element quality measures in one vectorized pass.
+
+    Parameters:
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3).
+        elements (np.ndarray): Connectivity of shape (n_elems, k) with 0-based node indices;
+                               mixed-cell meshes are evaluated per cell size.
+
+    Returns:
+        quality (dict): Arrays of shape (n_elems,):
+            area: cell area.
+            min_angle, max_angle: smallest and largest interior angle in degrees.
+            aspect_ratio: circumradius / (2 * inradius) for triangles (1 = equilateral),
+                          NaN for other cells.
+            edge_ratio: longest / shortest edge.
+            cfl_length: 2 * area / perimeter (inscribed circle diameter for triangles),
+                        the length scale of the explicit solver's CFL condition.
+    """
+    elements = np.asarray(elements)
+    sizes = element_sizes(elements)
+    if np.any(sizes != elements.shape[1]):
+        quality = {}
+        for k in np.unique(sizes):
+            rows = sizes == k
+            for name, values in element_quality(coords, elements[rows, :k]).items():
+                quality.setdefault(name, np.empty(len(elements)))[rows] = values
+        return quality
+
+    xy = np.asarray(coords)[:, :2][elements]
+    to_next = np.roll(xy, -1, axis=1) - xy
+    to_prev = np.roll(xy, 1, axis=1) - xy
+
+    edge = np.hypot(to_next[..., 0], to_next[..., 1])
+    cross = to_next[..., 0] * to_prev[..., 1] - to_next[..., 1] * to_prev[..., 0]
+    dot = np.einsum("...i,...i->...", to_next, to_prev)
+    angle = np.degrees(np.arctan2(np.abs(cross), dot))
+
+    area, _ = cell_geometry(coords, elements)
+    perimeter = edge.sum(axis=1)
+    if elements.shape[1] == 3:
+        # R / (2 r) = abc / (8 (s - a)(s - b)(s - c)), s = semi-perimeter
+        s = 0.5 * perimeter
+        with np.errstate(divide="ignore"):
+            aspect = edge.prod(axis=1) / (8.0 * np.prod(s[:, None] - edge, axis=1))
+    else:
+        aspect = np.full(len(elements), np.nan)
+
+    return {
+        "area": area,
+        "min_angle": angle.min(axis=1),
+        "max_angle": angle.max(axis=1),
+        "aspect_ratio": aspect,
+        "edge_ratio": edge.max(axis=1) / edge.min(axis=1),
+        "cfl_length": 2.0 * area / perimeter,
+    }
+
+
+def quality_summary(quality):
+    """
+    Reduces element_quality output to statistics and histograms.
+
+    Returns:
+        summary (dict): Per-measure min/mean/max, histograms (counts, bin edges),
+                        and the worst element for the CFL length scale.
+    """
+    summary = {"elements": len(quality["area"])}
+    for name, values in quality.items():
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            # e.g. aspect_ratio of an all-quad mesh
+            summary[name] = {"min": np.nan, "mean": np.nan, "max": np.nan}
+            continue
+        summary[name] = {"min": float(values.min()), "mean": float(values.mean()), "max": float(values.max())}
+    summary["histograms"] = {
+        "min_angle": np.histogram(quality["min_angle"], bins=ANGLE_BINS),
+        "aspect_ratio": np.histogram(quality["aspect_ratio"][np.isfinite(quality["aspect_ratio"])],
+                                     bins=ASPECT_BINS),
+        "edge_ratio": np.histogram(quality["edge_ratio"], bins=EDGE_RATIO_BINS),
+    }
+    worst = int(np.argmin(quality["cfl_length"]))
+    summary["cfl_worst_element"] = worst
+    summary["cfl_length_min"] = float(quality["cfl_length"][worst])
+    return summary
+
+
+def format_summary(summary, name=""):
+    """Human-readable quality report."""
+    lines = [f"Quality {name}: {summary['elements']} elements"]
+    for measure in ("min_angle", "max_angle", "aspect_ratio", "edge_ratio", "area", "cfl_length"):
+        if measure in summary:
+            stats = summary[measure]
+            lines.append(f"  {measure:>13}: min {stats['min']:.6g}  mean {stats['mean']:.6g}  max {stats['max']:.6g}")
+    lines.append(f"  CFL length scale: {summary['cfl_length_min']:.6g} (element {summary['cfl_worst_element'] + 1})")
+    for measure, (counts, edges) in summary["histograms"].items():
+        lines.append(f"  {measure} histogram:")
+        for count, lo, hi in zip(counts, edges[:-1], edges[1:]):
+            if count:
+                lines.append(f"    [{lo:7.4g}, {hi:7.4g}): {count}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from meshIO import read_mesh_bin, read_mesh_txt
+
+    parser = argparse.ArgumentParser(description="Report element quality of one or more meshes.")
+    parser.add_argument("meshes", nargs="+", help="mesh files (*.txt or *.mshb)")
+    args = parser.parse_args()
+
+    for filename in args.meshes:
+        nodes, elements = (read_mesh_bin if filename.endswith(".mshb") else read_mesh_txt)(filename)
+        print(format_summary(quality_summary(element_quality(nodes, elements)), filename))
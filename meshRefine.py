@@ -0,0 +1,186 @@
+import numpy as np
+
+from meshConnectivity import build_edges
+from meshIO import CHUNK_ROWS, create_arrays_bin, write_mesh_txt_stream
+from meshSubmesh import edge_keys
+
+
+def _check_triangles(elements):
+    elements = np.asarray(elements)
+    if elements.ndim != 2 or elements.shape[1] != 3:
+        raise ValueError(f"Uniform refinement needs triangles, got cells with {elements.shape[-1]} nodes.")
+    return elements
+
+
+def _children(elements, elem_edges, n_nodes):
+    """
+    The four children of every triangle (v0, v1, v2) with edge midpoints
+    m01, m12, m20 (node n_nodes + edge index): three corner triangles and the
+    middle one, all with the parent's orientation. Returns (n_elems, 4, 3).
+    """
+    m01, m12, m20 = (n_nodes + elem_edges).T
+    v0, v1, v2 = elements.T
+    return np.stack((np.stack((v0, m01, m20), axis=1),
+                     np.stack((m01, v1, m12), axis=1),
+                     np.stack((m20, m12, v2), axis=1),
+                     np.stack((m01, m12, m20), axis=1)), axis=1)
+
+
+def _split_edges(n_nodes, edge_nodes, table):
+    """
+    Splits the edges of a (n, 2 + m) table of node pairs (plus m extra columns, e.g.
+    boundary tags) at their midpoint nodes n_nodes + edge index: (a, b) -> (a, mid), (mid, b).
+    """
+    table = np.asarray(table, dtype=np.int64)
+    # build_edges numbers edges in ascending key order
+    keys = edge_keys(edge_nodes, n_nodes)
+    query = edge_keys(table[:, :2], n_nodes)
+    edge = np.minimum(np.searchsorted(keys, query), max(len(keys) - 1, 0))
+    if len(query) and not np.array_equal(keys[edge], query):
+        raise ValueError("Edge table references an edge that is not in the mesh.")
+    first = table.copy()
+    first[:, 1] = n_nodes + edge
+    second = table.copy()
+    second[:, 0] = n_nodes + edge
+    return np.stack((first, second), axis=1).reshape(-1, table.shape[1])
+
+
+def refine_uniform(coords, elements, boundary=None):
+    """
+    One level of uniform 1:4 (red) refinement of a triangle mesh.
+
+    Every edge gets one midpoint node, shared by the cells on both sides, so the
+    refined mesh is conforming. Existing nodes keep their indices; the midpoint of
+    edge e (meshConnectivity.build_edges numbering) is node n_nodes + e.
+
+    Parameters:
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3).
+        elements (np.ndarray): (n_elems, 3) triangles with 0-based node indices.
+        boundary (np.ndarray): Optional (n, 2 + m) table of node pairs plus m extra columns
+                               (e.g. $BoundaryEdges: node a, node b, tag) to split along.
+
+    Returns:
+        coords (np.ndarray): (n_nodes + n_edges, d) node coordinates.
+        elements (np.ndarray): (4 * n_elems, 3) triangles; children of cell i are 4i..4i+3.
+        parent (np.ndarray): (4 * n_elems,) parent cell of every new cell.
+        boundary (np.ndarray): Only if a boundary table is given: (2 * n, 2 + m) halves,
+                               edge i becomes rows 2i, 2i + 1.
+    """
+    coords = np.asarray(coords)
+    elements = _check_triangles(elements)
+    edge_nodes, _, elem_edges = build_edges(len(coords), elements)
+
+    midpoints = 0.5 * (coords[edge_nodes[:, 0]] + coords[edge_nodes[:, 1]])
+    children = _children(elements, elem_edges, len(coords))
+    parent = np.repeat(np.arange(len(elements)), 4)
+    refined = np.concatenate((coords, midpoints)), children.reshape(-1, 3), parent
+    if boundary is not None:
+        return refined + (_split_edges(len(coords), edge_nodes, boundary),)
+    return refined
+
+
+def refine_levels(coords, elements, levels, boundary=None):
+    """
+    Applies refine_uniform levels times; returns the final coords and elements
+    (and the split boundary table if one is given).
+    """
+    for _ in range(levels):
+        if boundary is None:
+            coords, elements, _ = refine_uniform(coords, elements)
+        else:
+            coords, elements, _, boundary = refine_uniform(coords, elements, boundary)
+    if boundary is None:
+        return coords, elements
+    return coords, elements, boundary
+
+
+def write_refined(output, coords, elements, levels=1, coord_format="%.16f", boundary=None):
+    """
+    Refines levels times and writes <output>.txt and <output>.mshb without holding the
+    finest level in memory: all but the last level are refined in memory, the last one
+    is generated and written CHUNK_ROWS parent cells (or edges) at a time.
+
+    Parameters:
+        output (str): Output path without extension.
+        coords, elements: Coarse triangle mesh.
+        levels (int): Number of 1:4 refinements (0 writes the mesh as is).
+        coord_format (str): See meshIO.write_mesh_txt.
+        boundary (np.ndarray): Optional (n, 3) boundary edges (node a, node b, tag), split
+                               with the mesh and written as the $BoundaryEdges section.
+
+    Returns:
+        summary (dict): Node, element (and boundary edge) counts of the written mesh.
+    """
+    coords = np.asarray(coords)
+    elements = _check_triangles(elements)
+    if levels > 0:
+        if boundary is None:
+            coords, elements = refine_levels(coords, elements, levels - 1)
+        else:
+            coords, elements, boundary = refine_levels(coords, elements, levels - 1, boundary)
+        edge_nodes, _, elem_edges = build_edges(len(coords), elements)
+        if boundary is not None:
+            boundary = _split_edges(len(coords), edge_nodes, boundary)
+    else:
+        edge_nodes = np.empty((0, 2), dtype=np.int64)
+        elem_edges = None
+    sections = {"BoundaryEdges": boundary} if boundary is not None else {}
+    n_coarse = len(coords)
+    n_nodes = n_coarse + len(edge_nodes)
+    n_elems = len(elements) * (4 if levels > 0 else 1)
+
+    def coord_chunks():
+        for start in range(0, n_coarse, CHUNK_ROWS):
+            yield coords[start:start + CHUNK_ROWS, :2]
+        for start in range(0, len(edge_nodes), CHUNK_ROWS):
+            block = edge_nodes[start:start + CHUNK_ROWS]
+            yield 0.5 * (coords[block[:, 0], :2] + coords[block[:, 1], :2])
+
+    def elem_chunks():
+        step = CHUNK_ROWS // 4 if levels > 0 else CHUNK_ROWS
+        for start in range(0, len(elements), step):
+            block = elements[start:start + step]
+            if levels > 0:
+                block = _children(block, elem_edges[start:start + step], n_coarse).reshape(-1, 3)
+            yield block
+
+    write_mesh_txt_stream(f"{output}.txt", n_nodes, coord_chunks(), n_elems, elem_chunks(), 3, coord_format,
+                          sections)
+
+    specs = {"nodes": ((n_nodes, 2), np.float64), "elements": ((n_elems, 3), np.int32)}
+    specs.update({name: (table.shape, np.int32) for name, table in sections.items()})
+    arrays = create_arrays_bin(f"{output}.mshb", specs)
+    for name, table in sections.items():
+        arrays[name][:] = table
+    row = 0
+    for block in coord_chunks():
+        arrays["nodes"][row:row + len(block)] = block
+        row += len(block)
+    row = 0
+    for block in elem_chunks():
+        arrays["elements"][row:row + len(block)] = block
+        row += len(block)
+    for a in arrays.values():
+        a.flush()
+    summary = {"nodes": n_nodes, "elements": n_elems}
+    if boundary is not None:
+        summary["boundary_edges"] = len(boundary)
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from meshIO import read_mesh_bin, read_mesh_txt
+
+    parser = argparse.ArgumentParser(description="Uniform 1:4 refinement of a triangle mesh.")
+    parser.add_argument("mesh", help="input mesh (*.txt or *.mshb)")
+    parser.add_argument("output", help="output path without extension")
+    parser.add_argument("--levels", type=int, default=1)
+    parser.add_argument("--format", default="%.16f", help="printf-style coordinate format of the .txt output")
+    args = parser.parse_args()
+
+    read = read_mesh_bin if args.mesh.endswith(".mshb") else read_mesh_txt
+    nodes, elements, sections = read(args.mesh, return_sections=True)
+    summary = write_refined(args.output, nodes, elements, args.levels, args.format, sections.get("BoundaryEdges"))
+    print(f"Info    : {summary['elements']} triangles, {summary['nodes']} nodes -> {args.output}.txt / .mshb")
@@ -0,0 +1,206 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+from meshConnectivity import build_edges, cell_geometry, node_to_elements
+from meshQuality import element_quality
+
+SMOOTH_METHODS = ("laplace", "angle", "quality")
+
+
+def boundary_nodes(n_nodes, edge_nodes, edge_cells):
+    """Boolean mask of the nodes on boundary edges (edges with right cell -1)."""
+    mask = np.zeros(n_nodes, dtype=bool)
+    mask[edge_nodes[edge_cells[:, 1] < 0].ravel()] = True
+    return mask
+
+
+def _signed_area(xy, elements):
+    x, y = xy[elements, 0], xy[elements, 1]
+    return 0.5 * (x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y).sum(axis=1)
+
+
+def _laplace_targets(xy, adjacency, degree):
+    """Mean of the edge neighbours."""
+    return adjacency @ xy / degree[:, None]
+
+
+def _quality_targets(xy, elements, incidence):
+    """
+    Mean of the centroids of the cells around every node, weighted by area times
+    aspect ratio: large and badly shaped cells pull their nodes harder.
+    """
+    area, centroid = cell_geometry(xy, elements)
+    aspect = element_quality(xy, elements)["aspect_ratio"]
+    weight = area * np.where(np.isfinite(aspect), aspect, 1.0)
+    return incidence @ (weight[:, None] * centroid) / (incidence @ weight)[:, None]
+
+
+def _angle_targets(xy, elements, elem_edges, edge_nodes, degree):
+    """
+    Angle-based smoothing (Zhou & Shimada): every neighbour j of node i rotates the
+    vector j -> i onto the bisector of the two cell angles at j next to edge (i, j);
+    the target is the mean of the rotated positions.
+
+    The rotations are accumulated per directed edge: slot 2e + d moves node
+    edge_nodes[e, d] around its other node.
+    """
+    p = xy[elements]
+    # Interior angle at every corner
+    to_next = np.roll(p, -1, axis=1) - p
+    to_prev = np.roll(p, 1, axis=1) - p
+    cross = to_next[..., 0] * to_prev[..., 1] - to_next[..., 1] * to_prev[..., 0]
+    angle = np.arctan2(np.abs(cross), np.einsum("...i,...i->...", to_next, to_prev))
+    orientation = np.sign(_signed_area(xy, elements))[:, None]
+
+    # In a counterclockwise cell (a, b, c), b -> a ends b's angle (rotate clockwise by
+    # half of it) and c -> a starts c's angle (rotate counterclockwise); local edge m
+    # joins corners m and m + 1
+    pivots = ((elem_edges, -np.roll(angle, -1, axis=1)),
+              (np.roll(elem_edges, -2, axis=1), np.roll(angle, -2, axis=1)))
+    n_slots = 2 * len(edge_nodes)
+    beta = np.zeros(n_slots)
+    for edge, rotation in pivots:
+        slot = 2 * edge + (edge_nodes[edge, 0] != elements)
+        beta += np.bincount(slot.ravel(), (0.5 * orientation * rotation).ravel(), minlength=n_slots)
+
+    slot_moved = edge_nodes.ravel()
+    slot_pivot = edge_nodes[:, ::-1].ravel()
+    d = xy[slot_moved] - xy[slot_pivot]
+    cos, sin = np.cos(beta), np.sin(beta)
+    rotated = xy[slot_pivot] + np.stack((cos * d[:, 0] - sin * d[:, 1], sin * d[:, 0] + cos * d[:, 1]), axis=1)
+    n_nodes = len(xy)
+    return np.stack([np.bincount(slot_moved, rotated[:, i], minlength=n_nodes) for i in range(2)],
+                    axis=1) / degree[:, None]
+
+
+def smooth_mesh(coords, elements, method="laplace", max_sweeps=50, relax=1.0, tol=0.01, fixed=None):
+    """
+    Moves the interior nodes of a mesh to improve its shape quality; topology and
+    boundary nodes are kept, so exported tables ($BoundaryEdges, $PeriodicEdges, .fvm
+    topology) remain valid.
+
+    Every sweep moves all free nodes at once (Jacobi style) towards the method's target,
+    then undoes the move of nodes around cells that it inverted until there are none.
+    Cells count as inverted against the orientation of the whole mesh (the sign of the
+    total area), so cells that are already inverted in the input may move, and their
+    minimum angle counts as negative: untangling them raises the worst angle.
+    Smoothing stops when a sweep raises the mean minimum angle by less than tol degrees
+    or lowers the worst minimum angle; a sweep that lowers the worst angle is discarded.
+
+    Parameters:
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3); only x, y move.
+        elements (np.ndarray): Connectivity with 0-based node indices (-1 padded for mixed cells).
+        method (str): "laplace": mean of the edge neighbours;
+                      "angle": angle-based smoothing (triangles only);
+                      "quality": quality- and area-weighted mean of the surrounding cell centroids.
+        max_sweeps (int): Upper bound on the number of sweeps.
+        relax (float): Fraction of the move towards the target per sweep.
+        tol (float): Stopping threshold for the mean minimum angle gain, degrees.
+        fixed (np.ndarray): Optional boolean mask of further nodes to keep in place.
+
+    Returns:
+        coords (np.ndarray): Smoothed coordinates (a copy).
+        report (dict): Sweeps done, min/mean minimum angle and inverted cells before and after.
+    """
+    if method not in SMOOTH_METHODS:
+        raise ValueError(f"Unknown smoothing method '{method}', expected one of {SMOOTH_METHODS}.")
+    coords = np.array(coords, dtype=np.float64)
+    elements = np.asarray(elements)
+    if method == "angle" and (elements.shape[1] != 3 or np.any(elements < 0)):
+        raise ValueError("Angle-based smoothing needs a triangle mesh.")
+    n_nodes = len(coords)
+    edge_nodes, edge_cells, elem_edges = build_edges(n_nodes, elements)
+
+    free = ~boundary_nodes(n_nodes, edge_nodes, edge_cells)
+    if fixed is not None:
+        free &= ~np.asarray(fixed, dtype=bool)
+    # Sparse node-node adjacency and node-cell incidence, built once and reused every sweep
+    rows = np.concatenate((edge_nodes[:, 0], edge_nodes[:, 1]))
+    cols = np.concatenate((edge_nodes[:, 1], edge_nodes[:, 0]))
+    adjacency = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_nodes, n_nodes)).tocsr()
+    degree = np.maximum(np.asarray(adjacency.sum(axis=1)).ravel(), 1)
+    offsets, indices = node_to_elements(n_nodes, elements)
+    incidence = csr_matrix((np.ones(len(indices)), indices, offsets), shape=(n_nodes, len(elements)))
+    cells = np.where(elements < 0, elements[:, :1], elements)
+    orientation = np.sign(_signed_area(coords[:, :2], cells).sum())
+
+    def inverted_cells(xy):
+        return np.sign(_signed_area(xy, cells)) != orientation
+
+    def min_angles(xy):
+        angle = element_quality(xy, elements)["min_angle"]
+        angle = np.where(inverted_cells(xy), -angle, angle)
+        return float(angle.min()), float(angle.mean())
+
+    inverted_before = int(np.count_nonzero(inverted_cells(coords[:, :2])))
+    before = min_angles(coords)
+    worst, mean = before
+    sweeps = 0
+    for _ in range(max_sweeps):
+        xy = coords[:, :2]
+        if method == "laplace":
+            target = _laplace_targets(xy, adjacency, degree)
+        elif method == "angle":
+            target = _angle_targets(xy, elements, elem_edges, edge_nodes, degree)
+        else:
+            target = _quality_targets(xy, elements, incidence)
+        moved = xy.copy()
+        moved[free] += relax * (target[free] - xy[free])
+
+        # Reverting nodes can invert cells around them that only some nodes moved in,
+        # so repeat until none is left (at worst every node is back at xy)
+        tangled = inverted_cells(xy)
+        inverted = inverted_cells(moved) & ~tangled
+        while np.any(inverted):
+            stuck = np.zeros(n_nodes, dtype=bool)
+            stuck[cells[inverted].ravel()] = True
+            moved[stuck] = xy[stuck]
+            inverted = inverted_cells(moved) & ~tangled
+
+        new_worst, new_mean = min_angles(moved)
+        if new_worst < worst:
+            break
+        coords[:, :2] = moved
+        sweeps += 1
+        gain = new_mean - mean
+        worst, mean = new_worst, new_mean
+        if gain < tol:
+            break
+
+    report = {"method": method, "sweeps": sweeps, "free_nodes": int(free.sum()),
+              "min_angle_before": before[0], "mean_min_angle_before": before[1],
+              "min_angle_after": worst, "mean_min_angle_after": mean,
+              "inverted_before": inverted_before, "inverted_after": int(np.count_nonzero(inverted_cells(coords[:, :2])))}
+    return coords, report
+
+
+def format_report(report):
+    """One-line smoothing summary."""
+    return (f"Smoothing ({report['method']}): {report['sweeps']} sweeps over {report['free_nodes']} free nodes, "
+            f"min angle {report['min_angle_before']:.2f} -> {report['min_angle_after']:.2f}, "
+            f"mean min angle {report['mean_min_angle_before']:.2f} -> {report['mean_min_angle_after']:.2f}, "
+            f"inverted cells {report['inverted_before']} -> {report['inverted_after']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from meshIO import read_mesh_bin, read_mesh_txt, write_mesh_bin, write_mesh_txt
+
+    parser = argparse.ArgumentParser(description="Smooth the interior nodes of a mesh (boundary nodes stay fixed).")
+    parser.add_argument("mesh", help="input mesh (*.txt or *.mshb)")
+    parser.add_argument("output", help="output path without extension")
+    parser.add_argument("--method", default="laplace", choices=SMOOTH_METHODS)
+    parser.add_argument("--sweeps", type=int, default=50, help="maximum number of sweeps")
+    parser.add_argument("--relax", type=float, default=1.0, help="fraction of the move per sweep")
+    parser.add_argument("--tol", type=float, default=0.01, help="minimum mean min-angle gain per sweep (degrees)")
+    parser.add_argument("--format", default="%.16f", help="printf-style coordinate format of the .txt output")
+    args = parser.parse_args()
+
+    read = read_mesh_bin if args.mesh.endswith(".mshb") else read_mesh_txt
+    nodes, elements, sections = read(args.mesh, return_sections=True)
+    nodes, report = smooth_mesh(nodes, elements, args.method, args.sweeps, args.relax, args.tol)
+    write_mesh_txt(f"{args.output}.txt", nodes, elements, coord_format=args.format, sections=sections)
+    write_mesh_bin(f"{args.output}.mshb", nodes, elements, sections)
+    print(format_report(report))
+    print(f"Info    : Mesh exported to {args.output}.txt / {args.output}.mshb")
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+def box_predicate(x_min, x_max, y_min, y_max):
+    """Vectorized predicate selecting points inside [x_min, x_max] x [y_min, y_max]."""
+    def inside(points):
+        return ((points[:, 0] >= x_min) & (points[:, 0] <= x_max) &
+                (points[:, 1] >= y_min) & (points[:, 1] <= y_max))
+    return inside
+
+
+def polygon_predicate(polygon):
+    """
+    Vectorized predicate selecting points inside a simple polygon (even-odd rule).
+
+    Parameters:
+        polygon (array-like): Polygon vertices of shape (n_vertices, 2), not closed.
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    start = polygon
+    end = np.roll(polygon, -1, axis=0)
+
+    def inside(points):
+        x = points[:, 0]
+        y = points[:, 1]
+        result = np.zeros(len(points), dtype=bool)
+        # Loop over the (few) polygon edges, vectorized over the (many) points
+        for (x0, y0), (x1, y1) in zip(start, end):
+            crosses = (y0 > y) != (y1 > y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+            result ^= crosses & (x < x_cross)
+        return result
+    return inside
+
+
+def edge_keys(edges, n_nodes):
+    """Encodes undirected edges (pairs of node indices) as sortable int64 keys."""
+    edges = np.sort(edges, axis=1).astype(np.int64)
+    return edges[:, 0] * n_nodes + edges[:, 1]
+
+
+def element_sizes(elements):
+    """Nodes of every cell; mixed meshes pad the connectivity of smaller cells with trailing -1."""
+    return np.count_nonzero(np.asarray(elements) >= 0, axis=1)
+
+
+def element_edges(elements):
+    """
+    Returns the edges of every element, (n_elems * k, 2), element by element and
+    in local order (n0, n1), (n1, n2), ..., (n_{k-1}, n0). In padded (mixed-cell)
+    connectivity the last real node connects back to n0 and padded slots give (-1, -1).
+    """
+    elements = np.asarray(elements)
+    following = np.roll(elements, -1, axis=1)
+    if elements.size and elements.min() < 0:
+        following[np.arange(len(elements)), element_sizes(elements) - 1] = elements[:, 0]
+        following[elements < 0] = -1
+    return np.stack((elements, following), axis=-1).reshape(-1, 2)
+
+
+def submesh(coords, elements, predicate, compact=True):
+    """
+    Extracts the elements whose nodes all satisfy the predicate.
+
+    Parameters:
+        coords (np.ndarray): Node coordinates of shape (n_nodes, 2) or (n_nodes, 3).
+        elements (np.ndarray): Connectivity of shape (n_elems, k) with 0-based node indices
+                               (-1 padded for mixed-cell meshes; padding is kept as is).
+        predicate (callable or np.ndarray): Vectorized function of the (n_nodes, d) coordinates
+                                            returning a boolean node mask, or the mask itself.
+        compact (bool): Drop nodes not used by any kept element (otherwise keep every
+                        selected node, as the old set-based crop did).
+
+    Returns:
+        sub_coords (np.ndarray): Coordinates of the kept nodes.
+        sub_elements (np.ndarray): Kept elements renumbered to the kept nodes.
+        node_map (np.ndarray): Original index of every kept node.
+        elem_mask (np.ndarray): Boolean mask of kept elements in the original mesh.
+        new_boundary (np.ndarray): Edges of shape (n_edges, 2), in the submesh numbering,
+                                   that were interior edges of the original mesh and are
+                                   boundary edges of the submesh.
+    """
+    coords = np.asarray(coords)
+    elements = np.asarray(elements)
+    n_nodes = len(coords)
+
+    node_mask = predicate(coords) if callable(predicate) else np.asarray(predicate, dtype=bool)
+    padding = elements < 0
+    # Padded slots of mixed-cell connectivity neither select nor reject a cell
+    selected = node_mask[elements] & ~padding
+    elem_mask = (selected | padding).all(axis=1)
+    kept = elements[elem_mask]
+
+    if compact:
+        keep_nodes = np.zeros(n_nodes, dtype=bool)
+        keep_nodes[kept[kept >= 0]] = True
+    else:
+        keep_nodes = node_mask
+    node_map = np.flatnonzero(keep_nodes)
+    # One extra slot maps the padding -1 to itself
+    lookup = np.full(n_nodes + 1, -1, dtype=np.int64)
+    lookup[node_map] = np.arange(len(node_map))
+
+    def real_edge_keys(cells):
+        edges = element_edges(cells)
+        return edge_keys(edges[edges[:, 0] >= 0], n_nodes)
+
+    # Boundary of the submesh: edges used by exactly one kept element. Such an edge was
+    # interior before the crop iff a removed element (with >= 2 selected nodes) shares it.
+    keys, counts = np.unique(real_edge_keys(kept), return_counts=True)
+    sub_boundary = keys[counts == 1]
+    touching = elements[~elem_mask & (selected.sum(axis=1) >= 2)]
+    cut = sub_boundary[np.isin(sub_boundary, real_edge_keys(touching))]
+    new_boundary = lookup[np.stack((cut // n_nodes, cut % n_nodes), axis=1)]
+
+    return coords[node_map], lookup[kept], node_map, elem_mask, new_boundary
@@ -1,6 +1,7 @@
 import gmsh
-import numpy as np
 from math import sqrt
+from meshIO import get_gmsh_mesh, write_mesh_bin, write_mesh_txt
+from meshSubmesh import box_predicate, submesh
 gmsh.initialize()
 
 # Set global mesh size (optional)
@@ -72,51 +73,16 @@ x_max = 0.6  # Upper x bound (adjust as needed)
 y_min = -1.0  # Lower y bound (adjust as needed)
 y_max = 2.0  # Upper y bound (adjust as needed)
 
-# Get nodes and filter
-node_tags, coords, _ = gmsh.model.mesh.getNodes()
-node_tags = np.array(node_tags)
-coords = np.array(coords).reshape(-1, 3)
-
-# Keep nodes within x and y bounds
-keep_mask = (
-        (coords[:, 0] >= x_min) &
-        (coords[:, 0] <= x_max) &
-        (coords[:, 1] >= y_min) &
-        (coords[:, 1] <= y_max)
-)
-kept_node_tags = node_tags[keep_mask]
-kept_coords = coords[keep_mask]
-
-# Create new node index mapping
-new_node_indices = {tag: idx + 1 for idx, tag in enumerate(kept_node_tags)}
-
-# Get elements and filter
-_, elem_node_tags = gmsh.model.mesh.getElementsByType(2)
-elem_node_tags = np.array(elem_node_tags).reshape(-1, 3)
-
-# Keep elements where all nodes are within bounds
-kept_nodes_set = set(kept_node_tags)
-valid_elements = [elem for elem in elem_node_tags if all(node in kept_nodes_set for node in elem)]
-
-# Map element nodes to new indices
-valid_elements_mapped = [[new_node_indices[node] for node in elem] for elem in valid_elements]
+# Get nodes and triangles, keep elements whose nodes all lie within the bounds
+coords, elements = get_gmsh_mesh(2)
+kept_coords, kept_elements, _, _, cut_edges = submesh(coords, elements, box_predicate(x_min, x_max, y_min, y_max))
+print(f"Info    : Crop kept {len(kept_elements)} of {len(elements)} triangles, {len(cut_edges)} new boundary edges")
 
 # Export cropped mesh
 filename = f"meshBrio.txt"
-with open(filename, "w") as f:
-    # Nodes
-    f.write("$Nodes\n")
-    f.write(f"{len(kept_node_tags)}\n")
-    for tag, (x, y, z) in zip(kept_node_tags, kept_coords):
-        f.write(f"{new_node_indices[tag]} {x:.6f} {y:.6f} 0.0\n")
-    f.write("$EndNodes\n")
-
-    # Elements
-    f.write("$Elements\n")
-    f.write(f"{len(valid_elements)}\n")
-    for idx, nodes in enumerate(valid_elements_mapped, 1):
-        f.write(f"{idx} 3 {' '.join(map(str, nodes))}\n")
-    f.write("$EndElements\n")
+write_mesh_txt(filename, kept_coords, kept_elements, coord_format="%.6f")
+# The text file keeps only 6 digits; the binary companion stores full precision
+write_mesh_bin("meshBrio.mshb", kept_coords, kept_elements)
 
 print(f"Info    : Cropped mesh saved to {filename}")
 
@@ -0,0 +1,225 @@
+import time
+
+import numpy as np
+
+from meshConnectivity import build_edges, periodic_edge_pairs, write_fvm_sidecar
+from meshDomains import BOUNDARY_TAGS, PERIODIC_TASKS, TASK_LC, TASKS, lc_from_N
+from meshIO import write_mesh_bin, write_mesh_txt
+from meshQuality import element_quality, quality_summary
+
+VARIANTS = ("equilateral", "right")
+
+
+def equilateral_lattice(x_min, x_max, y_min, y_max, h, even_rows=False):
+    """
+    Near-equilateral triangulation of a rectangle with edge length close to h.
+
+    Rows are dy = h * sqrt(3) / 2 apart; odd rows are shifted by half a spacing and get an
+    extra node on both vertical sides, so every boundary node lies exactly on the boundary.
+    Spacings are stretched slightly so that the lattice fits the rectangle exactly.
+    With even_rows the number of strips is rounded up to an even one, so the top row
+    matches the bottom row node for node (periodic meshes).
+
+    Returns:
+        coords (np.ndarray): (n_nodes, 2) node coordinates, row by row from y_min.
+        elements (np.ndarray): (n_elems, 3) counterclockwise triangles, strip by strip.
+    """
+    nx = max(1, int(round((x_max - x_min) / h)))
+    ny = max(1, int(round((y_max - y_min) / (h * np.sqrt(3) / 2))))
+    if even_rows:
+        ny += ny % 2
+    dx = (x_max - x_min) / nx
+
+    # Even rows: nx + 1 nodes; odd rows: nx shifted nodes plus one on each side
+    row_len = np.where(np.arange(ny + 1) % 2 == 0, nx + 1, nx + 2)
+    row_start = np.concatenate(([0], np.cumsum(row_len)[:-1]))
+
+    even_x = x_min + dx * np.arange(nx + 1)
+    odd_x = np.concatenate(([x_min], x_min + dx * (np.arange(nx) + 0.5), [x_max]))
+    x = np.concatenate([even_x if j % 2 == 0 else odd_x for j in range(ny + 1)])
+    y = np.repeat(np.linspace(y_min, y_max, ny + 1), row_len)
+
+    # Local triangles of a strip between an (nx + 1)-row "a" and an (nx + 2)-row "b",
+    # as offsets into a (2 * nx + 3)-long index vector [a_0..a_nx, b_0..b_{nx+1}]
+    i = np.arange(nx)
+    a = lambda k: k
+    b = lambda k: nx + 1 + k
+    up = [np.array([[a(0), b(1), b(0)]]),                        # left corner
+          np.stack((a(i), a(i + 1), b(i + 1)), axis=1),           # triangles on a-edges
+          np.stack((a(i[1:]), b(i[1:] + 1), b(i[1:])), axis=1),   # triangles on b-edges
+          np.array([[a(nx), b(nx + 1), b(nx)]])]                  # right corner
+    # Strip with "b" below and "a" above (mirror image)
+    down = [np.array([[b(0), b(1), a(0)]]),
+            np.stack((b(i + 1), a(i + 1), a(i)), axis=1),
+            np.stack((b(i[1:]), b(i[1:] + 1), a(i[1:])), axis=1),
+            np.array([[b(nx), b(nx + 1), a(nx)]])]
+    up = np.concatenate(up)
+    down = np.concatenate(down)
+
+    strips = np.arange(ny)
+    even = strips[strips % 2 == 0]
+    odd = strips[strips % 2 == 1]
+    # Global index of local offset k in strip j: a-row start + k for k <= nx, else b-row start + k - nx - 1
+    def to_global(local, a_start, b_start):
+        is_a = local <= nx
+        return np.where(is_a, a_start[:, None, None] + local, b_start[:, None, None] + local - (nx + 1))
+
+    elements = np.empty((ny, 2 * nx + 1, 3), dtype=np.int64)
+    elements[even] = to_global(up, row_start[even], row_start[even + 1])
+    elements[odd] = to_global(down, row_start[odd + 1], row_start[odd])
+    return np.stack((x, y), axis=1), elements.reshape(-1, 3)
+
+
+def right_lattice(x_min, x_max, y_min, y_max, h, alternate=True):
+    """
+    Right-triangle triangulation: an nx x ny grid of cells of size close to h, each split
+    along a diagonal (alternating direction in a checkerboard pattern if alternate).
+
+    Returns:
+        coords (np.ndarray): (n_nodes, 2) node coordinates, row by row from y_min.
+        elements (np.ndarray): (n_elems, 3) counterclockwise triangles.
+    """
+    nx = max(1, int(round((x_max - x_min) / h)))
+    ny = max(1, int(round((y_max - y_min) / h)))
+    x, y = np.meshgrid(np.linspace(x_min, x_max, nx + 1), np.linspace(y_min, y_max, ny + 1))
+    coords = np.stack((x.ravel(), y.ravel()), axis=1)
+
+    i, j = np.meshgrid(np.arange(nx), np.arange(ny))
+    n00 = (j * (nx + 1) + i).ravel()
+    n10, n01, n11 = n00 + 1, n00 + nx + 1, n00 + nx + 2
+    flip = ((i + j) % 2 == 1).ravel() if alternate else np.zeros(nx * ny, dtype=bool)
+
+    # Diagonal n00-n11, or n10-n01 on flipped cells
+    first = np.where(flip[:, None], np.stack((n00, n10, n01), axis=1), np.stack((n00, n10, n11), axis=1))
+    second = np.where(flip[:, None], np.stack((n10, n11, n01), axis=1), np.stack((n00, n11, n01), axis=1))
+    return coords, np.stack((first, second), axis=1).reshape(-1, 3)
+
+
+def boundary_edges(coords, elements, domain):
+    """
+    Boundary edges of a lattice of a rectangular domain, tagged by side like the gmsh
+    physical groups (meshDomains.BOUNDARY_TAGS).
+
+    Returns:
+        edges (np.ndarray): (n_edges, 3) int64 rows of node a, node b and the side tag,
+                            as in the $BoundaryEdges section of gmshGenerator.
+    """
+    x_min, x_max, y_min, y_max = domain
+    edge_nodes, edge_cells, _ = build_edges(len(coords), elements)
+    nodes = edge_nodes[edge_cells[:, 1] < 0]
+    midpoint = 0.5 * (coords[nodes[:, 0]] + coords[nodes[:, 1]])
+    eps = 1e-8 * max(x_max - x_min, y_max - y_min)
+    # Every boundary edge lies on exactly one side, so the conditions do not overlap
+    sides = [(np.abs(midpoint[:, 1] - y_min) < eps, "bottom"), (np.abs(midpoint[:, 0] - x_max) < eps, "right"),
+             (np.abs(midpoint[:, 1] - y_max) < eps, "top"), (np.abs(midpoint[:, 0] - x_min) < eps, "left")]
+    tag = np.select([on_side for on_side, _ in sides], [BOUNDARY_TAGS[name] for _, name in sides], 0)
+    return np.column_stack((nodes, tag)).astype(np.int64)
+
+
+def generate_structured(domain, lc, output, variant="equilateral", coord_format="%.16f", sidecar=True,
+                        periodic=False):
+    """
+    gmsh-free counterpart of gmshGenerator.generate_mesh for rectangular domains:
+    writes <output>.txt, <output>.mshb (with $BoundaryEdges and, if periodic,
+    $PeriodicEdges) and (optionally) <output>.fvm.
+
+    Returns:
+        summary (dict): Output name, node/element counts and headline quality.
+    """
+    if variant == "equilateral":
+        coords, elements = equilateral_lattice(*domain, lc, even_rows=periodic)
+    elif variant == "right":
+        coords, elements = right_lattice(*domain, lc)
+    else:
+        raise ValueError(f"Unknown variant '{variant}', expected one of {VARIANTS}.")
+
+    sections = {"BoundaryEdges": boundary_edges(coords, elements, domain)}
+    if periodic:
+        x_min, x_max, y_min, y_max = domain
+        sections["PeriodicEdges"] = periodic_edge_pairs(coords, elements, [(x_max - x_min, 0.0), (0.0, y_max - y_min)])
+
+    write_mesh_txt(f"{output}.txt", coords, elements, coord_format=coord_format, sections=sections)
+    write_mesh_bin(f"{output}.mshb", coords, elements, sections)
+    if sidecar:
+        write_fvm_sidecar(f"{output}.fvm", coords, elements)
+
+    quality = quality_summary(element_quality(coords, elements))
+    summary = {
+        "output": output,
+        "lc": lc,
+        "nodes": len(coords),
+        "elements": len(elements),
+        "boundary_edges": len(sections["BoundaryEdges"]),
+        "quality": {"min_angle": quality["min_angle"]["min"],
+                    "max_aspect_ratio": quality["aspect_ratio"]["max"],
+                    "cfl_length": quality["cfl_length_min"]},
+    }
+    if periodic:
+        summary["periodic_edges"] = len(sections["PeriodicEdges"])
+    return summary
+
+
+def benchmark(domain, Ns, output, variant="equilateral", lc=None):
+    """
+    Times the numpy lattice against the gmsh Frontal-Delaunay path (cache disabled)
+    for the same domain and resolutions. Needs gmsh only for the reference column.
+    An N of None uses the fixed lc instead (tasks without N, meshDomains.TASK_LC).
+
+    Returns:
+        rows (list): Per-N dicts with elements and seconds for both paths.
+    """
+    from gmshGenerator import generate_mesh
+
+    rows = []
+    for N in Ns:
+        mesh_lc = lc_from_N(N) if N is not None else lc
+        if mesh_lc is None:
+            raise ValueError("Benchmark without N needs a fixed lc.")
+        start = time.perf_counter()
+        structured = generate_structured(domain, mesh_lc, f"{output}_structured_{N}", variant)
+        structured_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        unstructured = generate_mesh(domain, mesh_lc, f"{output}_gmsh_{N}", cache=False)
+        gmsh_time = time.perf_counter() - start
+
+        rows.append({"N": N,
+                     "structured_elements": structured["elements"], "structured_seconds": structured_time,
+                     "structured_min_angle": structured["quality"]["min_angle"],
+                     "gmsh_elements": unstructured["elements"], "gmsh_seconds": gmsh_time,
+                     "gmsh_min_angle": unstructured["quality"]["min_angle"]})
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Structured lattice triangulation of rectangular domains.")
+    parser.add_argument("--task", type=int, default=103, choices=sorted(TASKS))
+    parser.add_argument("-N", type=int, nargs="+", help="resolution(s), lc = 2 / (N * sqrt(3))")
+    parser.add_argument("--variant", default="equilateral", choices=VARIANTS)
+    parser.add_argument("--output", help="output path without extension; {N} is replaced")
+    parser.add_argument("--no-sidecar", action="store_true")
+    parser.add_argument("--periodic", action="store_true",
+                        help=f"periodic boundaries in x and y (default for tasks {sorted(PERIODIC_TASKS)})")
+    parser.add_argument("--benchmark", action="store_true", help="compare against the gmsh path")
+    args = parser.parse_args()
+
+    domain, default_N = TASKS[args.task]
+    Ns = args.N or [default_N]
+
+    if args.benchmark:
+        print(f"{'N':>6} {'lattice elems':>14} {'lattice s':>10} {'min angle':>9} "
+              f"{'gmsh elems':>11} {'gmsh s':>8} {'min angle':>9} {'speedup':>8}")
+        for row in benchmark(domain, Ns, args.output or f"bench{args.task}", args.variant, TASK_LC.get(args.task)):
+            print(f"{str(row['N']):>6} {row['structured_elements']:14d} {row['structured_seconds']:10.3f} "
+                  f"{row['structured_min_angle']:9.2f} {row['gmsh_elements']:11d} {row['gmsh_seconds']:8.3f} "
+                  f"{row['gmsh_min_angle']:9.2f} {row['gmsh_seconds'] / row['structured_seconds']:8.1f}")
+    else:
+        for N in Ns:
+            lc = lc_from_N(N) if N is not None else TASK_LC[args.task]
+            output = (args.output or f"mesh{args.task}_structured_{{N}}").format(N=N)
+            summary = generate_structured(domain, lc, output, args.variant, sidecar=not args.no_sidecar,
+                                          periodic=args.periodic or args.task in PERIODIC_TASKS)
+            print(f"Info    : {summary['elements']} triangles, {summary['nodes']} nodes -> {output}.txt / .mshb "
+                  f"(min angle {summary['quality']['min_angle']:.2f})")
@@ -0,0 +1,217 @@
+import base64
+import lzma
+import mmap
+import zlib
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+VTK_TYPES = {
+    "Int8": "i1", "UInt8": "u1", "Int16": "i2", "UInt16": "u2", "Int32": "i4", "UInt32": "u4",
+    "Int64": "i8", "UInt64": "u8", "Float32": "f4", "Float64": "f8",
+}
+DECOMPRESSORS = {"vtkZLibDataCompressor": zlib.decompress, "vtkLZMADataCompressor": lzma.decompress}
+# Bytes read at a time while looking for the start of the appended data
+HEADER_SCAN = 1 << 20
+
+
+def _dtype(name, byte_order):
+    return np.dtype(("<" if byte_order == "LittleEndian" else ">") + VTK_TYPES[name])
+
+
+def _base64_chars(n_bytes):
+    """Length of the (padded) base64 encoding of n_bytes bytes."""
+    return 4 * -(-n_bytes // 3)
+
+
+def _read_xml(filename):
+    """
+    Parses the XML part of a .vtu file. With an <AppendedData> block only the bytes
+    before it are read; the raw data behind it may contain anything.
+
+    Returns:
+        root (xml.etree.ElementTree.Element): The <VTKFile> element.
+        appended (tuple): (encoding, file offset of the first data byte), or None.
+    """
+    with open(filename, "rb") as f:
+        head = b""
+        while True:
+            chunk = f.read(HEADER_SCAN)
+            head += chunk
+            tag = head.find(b"<AppendedData")
+            if tag >= 0 or not chunk:
+                break
+        if tag < 0:
+            return ET.fromstring(head), None
+        # The data starts after the "_" that follows the opening tag
+        while head.find(b">", tag) < 0 or head.find(b"_", head.find(b">", tag)) < 0:
+            chunk = f.read(HEADER_SCAN)
+            if not chunk:
+                raise ValueError(f"{filename}: truncated <AppendedData> block.")
+            head += chunk
+    opening = head[tag:head.find(b">", tag) + 1]
+    encoding = ET.fromstring(opening + b"</AppendedData>").get("encoding", "raw")
+    start = head.find(b"_", tag + len(opening)) + 1
+    root = ET.fromstring(head[:tag] + b"</VTKFile>")
+    return root, (encoding, start)
+
+
+class _Decoder:
+    """Decodes DataArray elements of one file (formats ascii, binary and appended)."""
+
+    def __init__(self, filename, root, appended):
+        self.filename = filename
+        self.byte_order = root.get("byte_order", "LittleEndian")
+        self.header_dtype = _dtype(root.get("header_type", "UInt32"), self.byte_order)
+        self.decompress = None
+        compressor = root.get("compressor")
+        if compressor:
+            if compressor not in DECOMPRESSORS:
+                raise ValueError(f"{filename}: unsupported compressor {compressor}.")
+            self.decompress = DECOMPRESSORS[compressor]
+        self.appended = appended
+        self._map = None
+
+    def _mapped(self):
+        if self._map is None:
+            with open(self.filename, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _header_bytes(self, n):
+        return n * self.header_dtype.itemsize
+
+    def _blocks(self, header, payload):
+        """Decompresses the blocks described by header [n_blocks, block, last, sizes...]."""
+        n_blocks = int(header[0])
+        sizes = header[3:3 + n_blocks].astype(np.int64)
+        starts = np.concatenate(([0], np.cumsum(sizes)))
+        return b"".join(self.decompress(payload[starts[i]:starts[i + 1]]) for i in range(n_blocks))
+
+    def _decode_base64(self, text):
+        """
+        Decodes one base64 array starting at the beginning of text (str, bytes or a
+        memoryview that may continue with further arrays, as in appended data); only the
+        characters of this array are copied. Uncompressed arrays are encoded in one piece
+        (header + data), compressed ones as separately encoded header and blocks.
+        """
+        if self.decompress is None:
+            size = self._header_bytes(1)
+            n_bytes = int(np.frombuffer(base64.b64decode(text[:_base64_chars(size)])[:size], self.header_dtype)[0])
+            return base64.b64decode(text[:_base64_chars(size + n_bytes)])[size:size + n_bytes]
+        # The header length follows from its first item, the block count
+        size = self._header_bytes(1)
+        n_blocks = int(np.frombuffer(base64.b64decode(text[:_base64_chars(size)])[:size], self.header_dtype)[0])
+        size = self._header_bytes(3 + n_blocks)
+        header_chars = _base64_chars(size)
+        header = np.frombuffer(base64.b64decode(text[:header_chars])[:size], self.header_dtype)
+        payload_chars = _base64_chars(int(header[3:].astype(np.int64).sum()))
+        return self._blocks(header, base64.b64decode(text[header_chars:header_chars + payload_chars]))
+
+    def _decode_appended(self, offset, dtype):
+        encoding, start = self.appended
+        buf = self._mapped()
+        position = start + offset
+        if encoding == "base64":
+            return np.frombuffer(self._decode_base64(memoryview(buf)[position:]), dtype)
+        if self.decompress is None:
+            n_bytes = int(np.frombuffer(buf, self.header_dtype, 1, position)[0])
+            # Uncompressed raw data is memory-mapped, not read
+            return np.memmap(self.filename, dtype=dtype, mode="r", offset=position + self._header_bytes(1),
+                             shape=(n_bytes // dtype.itemsize,))
+        n_blocks = int(np.frombuffer(buf, self.header_dtype, 1, position)[0])
+        header = np.frombuffer(buf, self.header_dtype, 3 + n_blocks, position)
+        payload_start = position + self._header_bytes(3 + n_blocks)
+        payload = buf[payload_start:payload_start + int(header[3:].astype(np.int64).sum())]
+        return np.frombuffer(self._blocks(header, payload), dtype)
+
+    def decode(self, element):
+        """
+        Returns:
+            values (np.ndarray): (n,) or (n, NumberOfComponents) array (a read-only
+                                 memmap for uncompressed raw appended data).
+        """
+        dtype = _dtype(element.get("type"), self.byte_order)
+        components = int(element.get("NumberOfComponents", 1))
+        fmt = element.get("format", "ascii")
+        if fmt == "ascii":
+            values = np.array((element.text or "").split(), dtype=dtype)
+        elif fmt == "binary":
+            values = np.frombuffer(self._decode_base64((element.text or "").strip()), dtype)
+        elif fmt == "appended":
+            values = self._decode_appended(int(element.get("offset")), dtype)
+        else:
+            raise ValueError(f"{self.filename}: unknown DataArray format '{fmt}'.")
+        return values.reshape(-1, components) if components > 1 else values
+
+
+def read_vtu(filename, cell_fields=(), point_fields=(), points=True, cells=True):
+    """
+    Reads selected arrays of a VTK XML unstructured grid (.vtu) without pyvista.
+
+    Only the XML header is parsed; arrays that are not requested are never decoded.
+    Inline ascii and base64 data and appended (raw or base64) data are supported, with
+    zlib or lzma compression; uncompressed raw appended arrays are memory-mapped.
+
+    Parameters:
+        filename (str): Path to the .vtu file (a single <Piece>).
+        cell_fields (tuple): Names of CellData arrays to read.
+        point_fields (tuple): Names of PointData arrays to read.
+        points (bool): Read the node coordinates ("points", (n_points, 3)).
+        cells (bool): Read "connectivity", "offsets" and "types" of the cells.
+
+    Returns:
+        arrays (dict): The requested arrays by name; cell and point fields of
+                       NumberOfComponents > 1 have shape (n, components).
+    """
+    root, appended = _read_xml(filename)
+    if root.get("type") != "UnstructuredGrid":
+        raise ValueError(f"{filename} is not a VTK unstructured grid.")
+    pieces = root.findall("./UnstructuredGrid/Piece")
+    if len(pieces) != 1:
+        raise ValueError(f"{filename} has {len(pieces)} pieces; only single-piece files are supported.")
+    piece = pieces[0]
+    decoder = _Decoder(filename, root, appended)
+
+    arrays = {}
+    if points:
+        arrays["points"] = decoder.decode(piece.find("./Points/DataArray"))
+    if cells:
+        for element in piece.findall("./Cells/DataArray"):
+            arrays[element.get("Name")] = decoder.decode(element)
+    for section, names in (("CellData", cell_fields), ("PointData", point_fields)):
+        found = {element.get("Name"): element for element in piece.findall(f"./{section}/DataArray")}
+        for name in names:
+            if name not in found:
+                raise KeyError(f"{section} array '{name}' not found in {filename}.")
+            arrays[name] = decoder.decode(found[name])
+    return arrays
+
+
+def cell_sizes(offsets):
+    """Number of nodes of every cell from the VTK offsets (end index of every cell)."""
+    return np.diff(np.concatenate(([0], np.asarray(offsets, dtype=np.int64))))
+
+
+def uniform_cells(connectivity, offsets):
+    """(n_cells, k) connectivity of a mesh whose cells all have k nodes."""
+    sizes = cell_sizes(offsets)
+    if len(sizes) and np.any(sizes != sizes[0]):
+        raise ValueError("Mesh mixes cell types; only uniform meshes are supported.")
+    k = int(sizes[0]) if len(sizes) else 0
+    return np.asarray(connectivity, dtype=np.int64).reshape(len(sizes), k)
+
+
+def cell_centers(points, connectivity, offsets):
+    """
+    Mean of the node coordinates of every cell (pyvista's cell_centers()), for uniform
+    and mixed cells alike.
+
+    Returns:
+        centers (np.ndarray): (n_cells, 3) cell centers.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    sizes = cell_sizes(offsets)
+    starts = np.asarray(offsets, dtype=np.int64) - sizes
+    sums = np.add.reduceat(points[np.asarray(connectivity, dtype=np.int64)], starts, axis=0)
+    return sums / sizes[:, None]